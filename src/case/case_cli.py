@@ -64,6 +64,13 @@ class CaseCLI:
           ("module_name", "Module name for which to generate the case report", {"nargs": "?"})
         ]
       },
+      "stats": {
+        "help": "Show run count, pass rate and sim time of each case in a module.",
+        "usage": "%(prog)s [module_name]",
+        "arguments": [
+          ("module_name", "Module name for which to show case statistics", {"nargs": "?"})
+        ]
+      },
       "del": {
         "help": "Delete a case. (Requires authorization)",
         "usage": "%(prog)s <case_name> [module_name]",
@@ -150,6 +157,8 @@ class CaseCLI:
       self.service.list_cases(module_name)
     elif args.subcommand == 'report':
       self.service.report(module_name)
+    elif args.subcommand == 'stats':
+      self.service.stats(module_name)
     elif args.subcommand == 'del':
       input_code = input("[VCM] Please enter authorization code to delete the case: ")
       if input_code != AUTH_CODE:
@@ -1,7 +1,10 @@
 from project.project_manager import ProjectManager
 from module.module_manager import ModuleManager
 import re
+import sqlite3
 import datetime
+from db_context import get_manager
+from db_manager import table_exists
 
 class CaseManager:
   def __init__(self, cursor):
@@ -12,28 +15,32 @@ class CaseManager:
         cursor: 数据库游标对象，用于执行 SQL 操作。
     """
     self.cursor = cursor
-    self.project_manager = ProjectManager(cursor)
-    self.module_manager = ModuleManager(cursor)
+    self.project_manager = get_manager(cursor, ProjectManager)
+    self.module_manager = get_manager(cursor, ModuleManager)
 
-  def add_case_basic(self, case_name: str, module_id: int, created_by: str) -> None:
+  def add_case_basic(self, case_name: str, module_id: int, created_by: str) -> int:
     """
-    添加基础用例信息。
+    添加基础用例信息，用例已存在（例如被并发的另一个进程先插入）时不重复添加。
 
     参数:
         case_name (str): 用例名称。
         module_id (int): 模块ID。
         created_by (str): 创建者。
+
+    返回:
+        int: 用例ID。
     """
 
     self.cursor.execute(
       '''
-      INSERT INTO case_info (case_name, case_c_name, case_c_group, module_id, support_bt, support_st, support_regr, support_post, support_ams, created_by)
+      INSERT OR IGNORE INTO case_info (case_name, case_c_name, case_c_group, module_id, support_bt, support_st, support_regr, support_post, support_ams, created_by)
       VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
       ''',
       (case_name, '', '', module_id, False, False, False, False, False, created_by)
     )
+    return self.find_case_id_by_module_id(case_name, module_id)
 
-  def add_case_bt(self, case_name: str, module_id: int, support_regr: bool, created_by: str) -> None:
+  def add_case_bt(self, case_name: str, module_id: int, support_regr: bool, created_by: str) -> bool:
     """
     添加BT类型用例信息。
 
@@ -42,15 +49,19 @@ class CaseManager:
         module_id (int): 模块ID。
         support_regr (bool): 是否支持回归。
         created_by (str): 创建者。
+
+    返回:
+        bool: 新增返回 True，同名用例已存在时返回 False。
     """
 
     self.cursor.execute(
       '''
-      INSERT INTO case_info (case_name, case_c_name, case_c_group, module_id, support_bt, support_st, support_regr, support_post, support_ams, created_by)
+      INSERT OR IGNORE INTO case_info (case_name, case_c_name, case_c_group, module_id, support_bt, support_st, support_regr, support_post, support_ams, created_by)
       VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
       ''',
       (case_name, '', '', module_id, True, False, support_regr, False, False, created_by)
     )
+    return self.cursor.rowcount > 0
 
   def add_case_st(
     self,
@@ -62,7 +73,7 @@ class CaseManager:
     support_post: bool,
     support_ams: bool,
     created_by: str
-  ) -> None:
+  ) -> bool:
     """
     添加ST类型用例信息。
 
@@ -75,15 +86,19 @@ class CaseManager:
         support_post (bool): 是否支持post。
         support_ams (bool): 是否支持ams。
         created_by (str): 创建者。
+
+    返回:
+        bool: 新增返回 True，同名用例已存在时返回 False。
     """
 
     self.cursor.execute(
       '''
-      INSERT INTO case_info (case_name, case_c_name, case_c_group, module_id, support_bt, support_st, support_regr, support_post, support_ams, created_by)
-      VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+      INSERT OR IGNORE INTO case_info (case_name, case_c_name, case_c_group, module_id, support_bt, support_st, support_regr, support_post, support_ams, created_by)
+      VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
       ''',
       (case_name, case_c_name, case_c_group, module_id, False, True, support_regr, support_post, support_ams, created_by)
     )
+    return self.cursor.rowcount > 0
 
   def find_cases_by_name(self, case_name: str) -> list:
     """
@@ -113,6 +128,19 @@ class CaseManager:
     case_id = self.cursor.fetchone()
     return case_id[0] if case_id else None
 
+  def find_case_ids_by_module_id(self, module_id: int) -> dict:
+    """
+    一次查询获取模块下所有用例的名称到ID映射。
+
+    参数:
+        module_id (int): 模块ID。
+
+    返回:
+        dict: {case_name: case_id}。
+    """
+    self.cursor.execute('SELECT case_name, case_id FROM case_info WHERE module_id = ?', (module_id,))
+    return {case_name: case_id for case_name, case_id in self.cursor.fetchall()}
+
   def update_case_st(self, case_id: int, case_c_name: str = None, case_c_group: str = None) -> None:
     """
     更新用例为ST类型，并修改中文名和分组。
@@ -231,7 +259,7 @@ class CaseManager:
     """
     return self.find_case_id_by_module_id(case_name, module_id) is not None
 
-  def update_case_name(self, old_case_name: str, new_case_name: str, module_name: str) -> None:
+  def update_case_name(self, old_case_name: str, new_case_name: str, module_name: str) -> bool:
     """
     更新指定模块下的用例名称。
 
@@ -239,19 +267,27 @@ class CaseManager:
         old_case_name (str): 原用例名称。
         new_case_name (str): 新用例名称。
         module_name (str): 模块名称。
+
+    返回:
+        bool: 重命名成功返回 True；模块不存在或新名称已被占用时返回 False。
     """
     module_id = self.module_manager.find_module_id_by_name(module_name)
     if module_id is None:
       print(f"[VCM] Module '{module_name}' does not exist.")
-      return
-    self.cursor.execute(
-      '''
-      UPDATE case_info
-      SET case_name = ?
-      WHERE case_name = ? AND module_id = ?
-      ''',
-      (new_case_name, old_case_name, module_id)
-    )
+      return False
+    try:
+      self.cursor.execute(
+        '''
+        UPDATE case_info
+        SET case_name = ?
+        WHERE case_name = ? AND module_id = ?
+        ''',
+        (new_case_name, old_case_name, module_id)
+      )
+    except sqlite3.IntegrityError:
+      print(f"[VCM] Error: Case '{new_case_name}' already exists under module '{module_name}'.")
+      return False
+    return True
 
   def delete_case(self, case_name: str, module_name: str) -> None:
     """
@@ -265,8 +301,70 @@ class CaseManager:
     if module_id is None:
       print(f"[VCM] Module '{module_name}' does not exist.")
       return
+    if table_exists(self.cursor, 'case_stats'):
+      self.cursor.execute(
+        'DELETE FROM case_stats WHERE case_id IN (SELECT case_id FROM case_info WHERE case_name = ? AND module_id = ?)',
+        (case_name, module_id)
+      )
     self.cursor.execute('DELETE FROM case_info WHERE case_name = ? AND module_id = ?', (case_name, module_id))
 
+  def list_cases_with_module_name(self, module_name: str) -> list:
+    """
+    列出指定模块下的所有用例，第二列为模块名称而非模块ID。
+
+    参数:
+        module_name (str): 模块名称。
+
+    返回:
+        list: 用例信息列表，列顺序与 case_info 表一致。
+    """
+    self.cursor.execute(
+      '''
+      SELECT c.case_id, m.module_name, c.created_at, c.created_by, c.case_name, c.case_c_name,
+             c.case_c_group, c.support_st, c.support_bt, c.support_regr, c.support_post, c.support_ams
+      FROM case_info c
+      JOIN modules m ON c.module_id = m.module_id
+      WHERE m.module_name = ?
+      ''',
+      (module_name,)
+    )
+    return self.cursor.fetchall()
+
+  def list_case_stats(self, module_name: str) -> list:
+    """
+    列出指定模块下每个用例的仿真统计，读取 case_stats 汇总表，没有已检查仿真的用例计数为 0。
+
+    参数:
+        module_name (str): 模块名称。
+
+    返回:
+        list: (case_name, run_count, pass_count, pass_rate, avg_sim_time, max_sim_time,
+               last_pass_sim_id, last_pass_at, last_fail_sim_id, last_fail_at) 元组列表，按用例名排序。
+              数据库尚未迁移出 case_stats 表时返回 None。
+    """
+    if not table_exists(self.cursor, 'case_stats'):
+      print("[VCM] Error: case_stats table not found, run 'vcm db migrate' first.")
+      return None
+    self.cursor.execute(
+      '''
+      SELECT c.case_name,
+             COALESCE(s.run_count, 0),
+             COALESCE(s.pass_count, 0),
+             CASE WHEN s.run_count > 0 THEN ROUND(100.0 * s.pass_count / s.run_count, 1) END,
+             CASE WHEN s.run_count > 0 THEN s.total_sim_time / s.run_count END,
+             s.max_sim_time,
+             s.last_pass_sim_id, s.last_pass_at,
+             s.last_fail_sim_id, s.last_fail_at
+      FROM case_info c
+      JOIN modules m ON c.module_id = m.module_id
+      LEFT JOIN case_stats s ON s.case_id = c.case_id
+      WHERE m.module_name = ?
+      ORDER BY c.case_name
+      ''',
+      (module_name,)
+    )
+    return self.cursor.fetchall()
+
   def list_cases(self, module_name: str) -> list:
     """
     列出指定模块下的所有用例。
@@ -1,9 +1,7 @@
 from tabulate import tabulate
 from utils.utils_format import fetch_with_headers
 from case.case_manager import CaseManager
-from module.module_manager import ModuleManager
-from constants import get_real_time
-from utils.utils_format import print_table
+from utils.utils_format import print_table, format_display_rows
 
 def generate_case_report(cursor, module_name: str) -> None:
   """
@@ -29,11 +27,9 @@ def generate_case_report(cursor, module_name: str) -> None:
 def print_cases_table(cursor, cases):
   """
   美观地格式化打印用例列表。
-  针对元组格式：(case_id, module_id, created_at, created_by, case_name, case_c_name, case_c_group, support_st, support_bt, support_regr, support_post, support_ams)
-  created_at 默认为UTC时间，显示时+8小时
+  针对元组格式：(case_id, module_name, created_at, created_by, case_name, case_c_name, case_c_group, support_st, support_bt, support_regr, support_post, support_ams)
+  即 CaseManager.list_cases_with_module_name 的返回结果，created_at 默认为UTC时间，显示时+8小时
   """
-  module_manager = ModuleManager(cursor)
-
   if not cases:
     print("[VCM] No cases found.")
     return
@@ -42,23 +38,20 @@ def print_cases_table(cursor, cases):
     "ID", "Module", "Created at", "Created by", "Case Name", "Case C Name",
     "Case Group", "ST", "BT", "REGR", "POST", "AMS"
   ]
+  kinds = [None, None, "time", None, None, None, None, "flag", "flag", "flag", "flag", "flag"]
+  print_table(headers, format_display_rows(cases, kinds))
 
-  def format_value(i, row):
-    if i == 1:
-      return module_manager.find_module_name_by_id(row[1]) or ""
-    elif i == 2:
-      try:
-        return get_real_time(row[2])
-      except Exception:
-        return str(row[2]) if row[2] is not None else ""
-    elif i in [7, 8, 9, 10, 11]:
-      return "✔" if row[i] in (1, True) else "X"
-    else:
-      return str(row[i]) if row[i] is not None else ""
+def print_case_stats_table(case_stats):
+  """
+  格式化打印用例统计。
+  针对元组格式：CaseManager.list_case_stats 的返回结果，last_pass_at / last_fail_at 为仿真的 created_at，写入时已是+8小时的本地时间，原样显示
+  """
+  if not case_stats:
+    print("[VCM] No cases found.")
+    return
 
-  # 格式化所有行，便于计算最大宽度
-  formatted_rows = [
-    [format_value(i, row) for i in range(len(headers))]
-    for row in cases
+  headers = [
+    "Case Name", "Runs", "Pass", "Pass Rate(%)", "Avg Time", "Max Time",
+    "Last Pass ID", "Last Pass At", "Last Fail ID", "Last Fail At"
   ]
-  print_table(headers, formatted_rows)
\ No newline at end of file
+  print_table(headers, format_display_rows(case_stats, [None] * len(headers)))
@@ -2,7 +2,8 @@ from case.case_manager import CaseManager
 from module.module_manager import ModuleManager
 from constants import AUTH_CODE, get_current_user
 from case.case_report import generate_case_report
-from case.case_report import print_cases_table
+from case.case_report import print_cases_table, print_case_stats_table
+from db_context import get_manager
 
 class CaseService:
   def __init__(self, cursor, logger):
@@ -15,8 +16,8 @@ class CaseService:
     """
     self.cursor = cursor
     self.logger = logger
-    self.manager = CaseManager(cursor)
-    self.module_manager = ModuleManager(cursor)
+    self.manager = get_manager(cursor, CaseManager)
+    self.module_manager = get_manager(cursor, ModuleManager)
 
   def add_bt(self, case_name: str, module_name: str):
     """
@@ -33,7 +34,9 @@ class CaseService:
     if self.manager.exist_case(case_name, module_id):
       self.logger.log(f"Case '{case_name}' already exists under module '{module_name}'.", level="WARNING")
       return False
-    self.manager.add_case_bt(case_name, module_id, False, get_current_user())
+    if not self.manager.add_case_bt(case_name, module_id, False, get_current_user()):
+      self.logger.log(f"Case '{case_name}' already exists under module '{module_name}'.", level="WARNING")
+      return False
     self.logger.log(f"BT case '{case_name}' added under module '{module_name}'.", level="INFO")
     return True
 
@@ -54,7 +57,9 @@ class CaseService:
     if self.manager.exist_case(case_name, module_id):
       self.logger.log(f"Case '{case_name}' already exists under module '{module_name}'.", level="WARNING")
       return False
-    self.manager.add_case_st(case_name, case_c_name, case_c_group, module_id, False, False, False, get_current_user())
+    if not self.manager.add_case_st(case_name, case_c_name, case_c_group, module_id, False, False, False, get_current_user()):
+      self.logger.log(f"Case '{case_name}' already exists under module '{module_name}'.", level="WARNING")
+      return False
     self.logger.log(f"ST case '{case_name}' added under module '{module_name}'.", level="INFO")
     return True
 
@@ -85,7 +90,8 @@ class CaseService:
       new_case_name (str): 新用例名称。
       module_name (str): 模块名称。
     """
-    self.manager.update_case_name(old_case_name, new_case_name, module_name)
+    if not self.manager.update_case_name(old_case_name, new_case_name, module_name):
+      return
     self.logger.log(f"Case '{old_case_name}' renamed to '{new_case_name}' under module '{module_name}'.", level="INFO")
 
   def list_cases(self, module_name: str) -> None:
@@ -95,7 +101,7 @@ class CaseService:
     参数:
       module_name (str): 模块名称。
     """
-    cases = self.manager.list_cases(module_name)
+    cases = self.manager.list_cases_with_module_name(module_name)
     if cases:
       print_cases_table(self.cursor, cases)
     else:
@@ -113,6 +119,21 @@ class CaseService:
     """
     return generate_case_report(self.manager, module_name)
 
+  def stats(self, module_name: str) -> None:
+    """
+    打印指定模块下每个用例的仿真统计（运行次数、通过率、仿真时间、最近通过/失败）。
+
+    参数:
+      module_name (str): 模块名称。
+    """
+    case_stats = self.manager.list_case_stats(module_name)
+    if case_stats is None:
+      return
+    if case_stats:
+      print_case_stats_table(case_stats)
+    else:
+      print(f"[VCM] No cases found under module '{module_name}'.")
+
   def delete(self, case_name: str, module_name: str):
     """
     删除指定模块下的用例。
@@ -2,18 +2,22 @@
 全局常量定义
 """
 import os
-import subprocess
+import socket
 import datetime
+import functools
 
+# 用户名、主机名在进程内不变，首次调用时解析并缓存，加载大量 TaskItem 时不再重复获取
+@functools.lru_cache(maxsize=None)
 def get_current_user():
   try:
     return os.getlogin()
   except Exception:
     return os.environ.get("USER", "unknown")
 
+@functools.lru_cache(maxsize=None)
 def get_current_host():
   try:
-    return subprocess.check_output(['hostname']).strip().decode('utf-8')
+    return socket.gethostname()
   except Exception:
     return "unknown"
   
@@ -60,10 +64,27 @@ VCM_DB_DEFAULT = os.path.join(os.getcwd(), "vcm.db")
 FILE_VCM_TASK = os.path.join(os.getcwd(), "vcm_task_info.json")
 VCM_TASK_FILENAME = "vcm_task_info.json"
 VCM_REGR_FILENAME = "vcm_regr_info.json"
+VCM_SCAN_FILENAME = "vcm_regr_scan.json"
+VCM_REGR_STATE_FILENAME = "vcm_regr_state.db"
+# 回归状态存储后端: json(整体读写 vcm_regr_info.json) / sqlite(vcm_regr_state.db，按条目增量写入)
+REGR_STATE_BACKEND = os.getenv("VCM_REGR_STATE_BACKEND", "json")
+
+LOG_CACHE_EN = True
+# 日志扫描后端: stream(分块读取) / mmap(内存映射，适合本地盘上的大日志)
+LOG_SCAN_BACKEND = os.getenv("VCM_LOG_SCAN_BACKEND", "stream")
 
 REMOTE_EN = False
 REMOTE_API_URL = "http://example.com/api"
 
+# SQLite 连接参数；数据库位于 NFS 等不支持共享内存的文件系统时设置 VCM_DB_JOURNAL_MODE=DELETE
+DB_JOURNAL_MODE = os.getenv("VCM_DB_JOURNAL_MODE", "WAL").upper()
+DB_BUSY_TIMEOUT = int(os.getenv("VCM_DB_BUSY_TIMEOUT", "30000"))  # ms
+DB_LOCK_RETRIES = 5
+DB_RETRY_DELAY = 0.1  # s，每次重试加倍
+DB_CACHE_SIZE = -65536  # KiB，即 64MB
+DB_MMAP_SIZE = 256 * 1024 * 1024
+DB_CACHED_STATEMENTS = 256
+
 MYSQL_EN = False
 MYSQL_HOST = "localhost"
 MYSQL_USER = "root"
@@ -0,0 +1,63 @@
+"""
+进程内共享的数据访问上下文
+"""
+
+_DB_CONTEXTS = {}
+
+class DbContext:
+  """
+  每个数据库连接对应一个上下文：持有共享游标和各 Manager 单例，
+  并在命令生命周期内缓存模块名称与ID的对应关系。
+  """
+  def __init__(self, conn):
+    self.conn = conn
+    self.cursor = conn.cursor()
+    self.managers = {}
+    self.module_ids = {}
+    self.module_names = {}
+
+  def get_manager(self, manager_cls):
+    """
+    获取共享的 Manager 实例，首次使用时创建。
+
+    参数:
+      manager_cls: Manager 类，构造参数为 cursor。
+
+    返回:
+      manager_cls 实例。
+    """
+    manager = self.managers.get(manager_cls)
+    if manager is None:
+      manager = manager_cls(self.cursor)
+      self.managers[manager_cls] = manager
+    return manager
+
+  def clear_module_cache(self):
+    """
+    模块新增、改名或删除后清空模块缓存。
+    """
+    self.module_ids.clear()
+    self.module_names.clear()
+
+def get_db_context(cursor_or_conn):
+  """
+  获取连接对应的共享上下文，参数可以是连接或其游标。
+  """
+  conn = getattr(cursor_or_conn, "connection", cursor_or_conn)
+  context = _DB_CONTEXTS.get(id(conn))
+  if context is None or context.conn is not conn:
+    context = DbContext(conn)
+    _DB_CONTEXTS[id(conn)] = context
+  return context
+
+def get_manager(cursor, manager_cls):
+  """
+  获取 cursor 所属连接上共享的 Manager 实例。
+  """
+  return get_db_context(cursor).get_manager(manager_cls)
+
+def release_db_context(conn):
+  """
+  连接关闭时释放对应的上下文。
+  """
+  _DB_CONTEXTS.pop(id(conn), None)
@@ -1,11 +1,74 @@
 """
 数据库连接与初始化
 """
+import time
+import random
 import sqlite3
 from constants import VCM_DB_DEFAULT
 from contextlib import contextmanager
 #import pymysql
 from constants import MYSQL_EN, MYSQL_HOST, MYSQL_USER, MYSQL_PASSWORD, MYSQL_DB, VCM_DB_DEFAULT
+from constants import DB_JOURNAL_MODE, DB_BUSY_TIMEOUT, DB_LOCK_RETRIES, DB_RETRY_DELAY, DB_CACHE_SIZE, DB_MMAP_SIZE, DB_CACHED_STATEMENTS
+from db_context import release_db_context
+
+def is_db_locked_error(e):
+  """
+  判断异常是否为数据库被锁（database is locked / busy）。
+  """
+  msg = str(e).lower()
+  return isinstance(e, sqlite3.OperationalError) and ("locked" in msg or "busy" in msg)
+
+def retry_on_locked(func, *args, retries=DB_LOCK_RETRIES, delay=DB_RETRY_DELAY, **kwargs):
+  """
+  调用 func，遇到数据库被锁时按指数退避（带随机抖动）重试。
+
+  参数:
+    func: 要执行的函数。
+    retries: 最大重试次数。
+    delay: 首次重试等待秒数，之后每次加倍。
+
+  返回:
+    func 的返回值，重试耗尽后抛出最后一次异常。
+  """
+  for attempt in range(retries + 1):
+    try:
+      return func(*args, **kwargs)
+    except sqlite3.OperationalError as e:
+      if not is_db_locked_error(e) or attempt == retries:
+        raise
+      print(f"[VCM] Warning: Database is locked, retrying ({attempt + 1}/{retries}).")
+      time.sleep(delay * (2 ** attempt) * (1 + random.random()))
+
+def open_sqlite_connection(db_name, journal_mode=DB_JOURNAL_MODE, busy_timeout=DB_BUSY_TIMEOUT):
+  """
+  打开 SQLite 连接并设置并发相关参数。
+
+  WAL 模式下读写互不阻塞，写入只需 synchronous=NORMAL；
+  WAL 依赖共享内存，数据库放在 NFS 上时应使用 DELETE 模式。
+
+  参数:
+    db_name: 数据库文件路径。
+    journal_mode: 日志模式（WAL/DELETE/...），为空时不修改。
+    busy_timeout: 等待锁的超时时间（毫秒）。
+
+  返回:
+    sqlite3.Connection
+  """
+  conn = sqlite3.connect(db_name, timeout=busy_timeout / 1000, cached_statements=DB_CACHED_STATEMENTS)
+  try:
+    conn.execute(f'PRAGMA busy_timeout = {int(busy_timeout)}')
+    if journal_mode:
+      mode = conn.execute(f'PRAGMA journal_mode = {journal_mode}').fetchone()[0]
+      if mode.upper() != journal_mode:
+        print(f"[VCM] Warning: journal_mode '{journal_mode}' not supported, using '{mode}'.")
+      if mode.upper() == 'WAL':
+        conn.execute('PRAGMA synchronous = NORMAL')
+    conn.execute(f'PRAGMA cache_size = {DB_CACHE_SIZE}')
+    conn.execute(f'PRAGMA mmap_size = {DB_MMAP_SIZE}')
+  except Exception:
+    conn.close()
+    raise
+  return conn
 
 @contextmanager
 def db_connection(db_name=VCM_DB_DEFAULT):
@@ -20,12 +83,75 @@ def db_connection(db_name=VCM_DB_DEFAULT):
     #)
     pass
   else:
-    conn = sqlite3.connect(db_name)
+    conn = retry_on_locked(open_sqlite_connection, db_name)
     try:
       yield conn
     finally:
-      conn.commit()
-      conn.close()
+      try:
+        retry_on_locked(conn.commit)
+      finally:
+        release_db_context(conn)
+        conn.close()
+
+def table_exists(cursor, table_name):
+  """
+  判断数据库中是否存在指定表。
+  """
+  cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (table_name,))
+  return cursor.fetchone() is not None
+
+# 常用查询条件上的索引: (索引名, 表名, 列)
+DB_INDEXES = [
+  ('idx_project_name', 'projects', 'project_name'),
+  ('idx_modules_project_id', 'modules', 'project_id'),
+  ('idx_modules_module_name', 'modules', 'module_name'),
+  ('idx_case_info_case_name', 'case_info', 'case_name'),
+  ('idx_sim_info_task_id', 'sim_info', 'task_id'),
+  ('idx_sim_info_case_id', 'sim_info', 'case_id'),
+  ('idx_sim_info_created_by', 'sim_info', 'created_by'),
+  ('idx_tasks_module_id', 'tasks', 'module_id'),
+  ('idx_tasks_regr_id', 'tasks', 'regr_id'),
+  ('idx_regr_info_module_id', 'regr_info', 'module_id'),
+]
+
+def create_indexes(cursor):
+  """
+  创建常用查询索引，已存在的索引跳过，可在已有数据库上重复执行。
+
+  case_info(module_id, case_name) 建为唯一索引；已有重复用例时退化为普通索引并给出警告。
+  """
+  for index_name, table_name, columns in DB_INDEXES:
+    cursor.execute(f'CREATE INDEX IF NOT EXISTS {index_name} ON {table_name}({columns})')
+
+  cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = 'idx_case_info_module_case'")
+  if cursor.fetchone():
+    return
+  try:
+    cursor.execute('CREATE UNIQUE INDEX IF NOT EXISTS ux_case_info_module_case ON case_info(module_id, case_name)')
+  except sqlite3.IntegrityError:
+    print("[VCM] Warning: Duplicate cases found in case_info, creating non-unique index on (module_id, case_name).")
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_case_info_module_case ON case_info(module_id, case_name)')
+
+def create_case_stats_table(cursor):
+  """
+  创建 case_stats 用例统计表，每个用例一行，由 SimManager.update_sim_time_pass 增量维护。
+
+  只统计已检查(is_check)的仿真；last_pass_* / last_fail_* 为 sim_id 最大的通过/失败仿真及其创建时间。
+  """
+  cursor.execute('''
+    CREATE TABLE IF NOT EXISTS case_stats (
+      case_id INTEGER PRIMARY KEY,
+      run_count INTEGER NOT NULL DEFAULT 0,
+      pass_count INTEGER NOT NULL DEFAULT 0,
+      total_sim_time INTEGER NOT NULL DEFAULT 0,
+      max_sim_time INTEGER NOT NULL DEFAULT 0,
+      last_pass_sim_id INTEGER,
+      last_pass_at TIMESTAMP,
+      last_fail_sim_id INTEGER,
+      last_fail_at TIMESTAMP,
+      FOREIGN KEY (case_id) REFERENCES case_info(case_id)
+    )
+  ''')
 
 # 初始化数据库并创建表
 def init_database(cursor):
@@ -124,14 +250,18 @@ def init_database(cursor):
       error_num INTEGER,
       timing_num INTEGER,
       is_pass BOOLEAN,
+      -- 迁移步骤 2 用 ADD COLUMN 追加该列，新建库也放在最后，保证 SELECT * 的列顺序一致
+      sim_dir TEXT,
       FOREIGN KEY (task_id) REFERENCES tasks(task_id),
       FOREIGN KEY (case_id) REFERENCES case_info(case_id)
     )
   ''')
 
+  # 创建 case_stats 表
+  create_case_stats_table(cursor)
+
   # IDX
-  cursor.execute('CREATE INDEX IF NOT EXISTS idx_project_name ON projects(project_name);')
-  cursor.execute('CREATE INDEX IF NOT EXISTS idx_modules_project_id ON modules(project_id);')
+  create_indexes(cursor)
 
   #View
   cursor.execute('''
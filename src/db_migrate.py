@@ -0,0 +1,134 @@
+"""
+数据库结构版本迁移
+"""
+import sqlite3
+from constants import get_current_user
+from db_manager import create_indexes, create_case_stats_table, retry_on_locked
+from sim.sim_manager import SimManager
+from utils.utils_format import print_table
+
+def column_exists(cursor, table_name, column_name):
+  """
+  判断表中是否存在指定列。
+  """
+  cursor.execute(f'PRAGMA table_info({table_name})')
+  return column_name in [row[1] for row in cursor.fetchall()]
+
+def add_column(cursor, table_name, column_name, column_def):
+  """
+  为已有表增加列，列已存在时跳过。
+  """
+  if not column_exists(cursor, table_name, column_name):
+    cursor.execute(f'ALTER TABLE {table_name} ADD COLUMN {column_name} {column_def}')
+
+def _migrate_indexes(cursor):
+  create_indexes(cursor)
+
+def _migrate_sim_dir(cursor):
+  add_column(cursor, 'sim_info', 'sim_dir', 'TEXT')
+
+def _migrate_case_stats(cursor):
+  create_case_stats_table(cursor)
+  SimManager(cursor).refresh_case_stats()
+
+# 按版本号顺序执行的迁移步骤: (版本号, 描述, 函数)，新步骤只能追加在末尾
+MIGRATIONS = [
+  (1, "Add lookup indexes on case/sim/task/regr tables", _migrate_indexes),
+  (2, "Add sim_info.sim_dir column", _migrate_sim_dir),
+  (3, "Add case_stats table and backfill from sim_info", _migrate_case_stats),
+]
+
+def ensure_schema_version_table(cursor):
+  cursor.execute('''
+    CREATE TABLE IF NOT EXISTS schema_version (
+      version INTEGER PRIMARY KEY,
+      description TEXT,
+      applied_at TIMESTAMP DEFAULT (DATETIME('now', '+8 hours')),
+      applied_by TEXT
+    )
+  ''')
+
+def get_schema_version(cursor):
+  """
+  获取数据库当前结构版本，未做过迁移时为 0。
+  """
+  cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'schema_version'")
+  if not cursor.fetchone():
+    return 0
+  cursor.execute('SELECT COALESCE(MAX(version), 0) FROM schema_version')
+  return cursor.fetchone()[0]
+
+def get_pending_migrations(cursor):
+  """
+  返回尚未执行的迁移步骤列表。
+  """
+  current_version = get_schema_version(cursor)
+  return [m for m in MIGRATIONS if m[0] > current_version]
+
+def _apply_migration(conn, version, description, func):
+  # 每个步骤单独持有写锁，WAL 模式下其他进程仍可读
+  cursor = conn.cursor()
+  cursor.execute('BEGIN IMMEDIATE')
+  try:
+    # 拿到写锁后再确认一次，避免多个进程重复执行
+    if get_schema_version(cursor) >= version:
+      conn.rollback()
+      return False
+    func(cursor)
+    cursor.execute(
+      'INSERT INTO schema_version (version, description, applied_by) VALUES (?, ?, ?)',
+      (version, description, get_current_user())
+    )
+    conn.commit()
+    return True
+  except Exception:
+    conn.rollback()
+    raise
+
+def migrate_database(conn):
+  """
+  依次执行所有未执行的迁移步骤，可在数据库使用中在线执行。
+
+  参数:
+    conn: sqlite3 连接。
+
+  返回:
+    bool: 全部成功返回 True。
+  """
+  conn.commit()
+  cursor = conn.cursor()
+  ensure_schema_version_table(cursor)
+  conn.commit()
+
+  pending = get_pending_migrations(cursor)
+  if not pending:
+    print(f"[VCM] Database schema is up to date (version {get_schema_version(cursor)}).")
+    return True
+
+  for version, description, func in pending:
+    try:
+      applied = retry_on_locked(_apply_migration, conn, version, description, func)
+    except sqlite3.Error as e:
+      print(f"[VCM] Error: Migration {version} '{description}' failed: {e}")
+      return False
+    if applied:
+      print(f"[VCM] Migration {version} applied: {description}")
+  print(f"[VCM] Database schema version: {get_schema_version(cursor)}")
+  return True
+
+def print_migration_status(cursor):
+  """
+  打印数据库结构版本和各迁移步骤的执行情况。
+  """
+  current_version = get_schema_version(cursor)
+  applied = {}
+  if current_version > 0:
+    cursor.execute('SELECT version, applied_at, applied_by FROM schema_version')
+    applied = {row[0]: row[1:] for row in cursor.fetchall()}
+
+  rows = []
+  for version, description, _ in MIGRATIONS:
+    applied_at, applied_by = applied.get(version, ("", ""))
+    rows.append([version, description, "applied" if version in applied else "pending", applied_at, applied_by])
+  print(f"[VCM] Database schema version: {current_version} (latest {MIGRATIONS[-1][0]})")
+  print_table(["Version", "Description", "Status", "Applied At", "Applied By"], rows)
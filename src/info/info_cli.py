@@ -97,7 +97,7 @@ class InfoCLI:
       self.service._handle_checkcomp(args)
     elif args.subcommand == "jobstatus":
       job_id = args.job_id
-      status, node_name = get_job_status_name(job_id)
+      status, node_name, _ = get_job_status_name(job_id)
       if status is None:
         print(f"[VCM] Error: Job ID '{job_id}' not found.")
       else:
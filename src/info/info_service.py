@@ -10,7 +10,7 @@ from utils.utils_env import check_regr_comp_result
 from utils.utils_log import Logger
 from item.regr_list_item import RegrListItem
 from utils.utils_format import print_regr_case_status
-from constants import VCM_REGR_FILENAME
+from db_context import get_manager
 
 
 class InfoService:
@@ -21,8 +21,8 @@ class InfoService:
   def __init__(self, cursor, logger: Logger):
     self.cursor = cursor
     self.logger = logger
-    self.module_manager = ModuleManager(cursor)
-    self.case_manager = CaseManager(cursor)
+    self.module_manager = get_manager(cursor, ModuleManager)
+    self.case_manager = get_manager(cursor, CaseManager)
 
   def _handle_caselist(self, args):
     """
@@ -66,8 +66,7 @@ class InfoService:
       # Check if the case exists in the database
       if self.case_manager.exist_case(case_name, module_id) is False:
         print(f"[VCM] Error: Case '{case_name}' not found in module '{module_name}'.")
-        self.case_manager.add_case_basic(case_name, module_id, get_current_user())
-        case_id = self.case_manager.find_case_id_by_module_id(case_name, module_id)
+        case_id = self.case_manager.add_case_basic(case_name, module_id, get_current_user())
         group_name, case_c_name = find_case_sw_info(case_name)
         if not group_name or not case_c_name:
           print(f"[VCM] Warning: Case '{case_name}' not found in case_info.")
@@ -113,17 +112,17 @@ class InfoService:
     """
 
     # check regr_list file exist
-    if not os.path.exists(VCM_REGR_FILENAME):
+    if not RegrListItem.exists():
       self.logger.log("No regression list file found.", level="ERROR")
       return
 
-    # Check if the regression ID exists
-    regr_list = RegrListItem.load_from_file()
-    if not regr_list:
+    # 只需要状态计数，流式统计，不加载完整的回归状态
+    regr_summaries = RegrListItem.summarize()
+    if not regr_summaries:
       self.logger.log("No regression list found.", level="ERROR")
       return
     
-    print_regr_case_status(regr_list)
+    print_regr_case_status(regr_summaries)
 
   def _handle_find_sw(self, args):
     
@@ -1,7 +1,11 @@
 import json
 import os
+from utils.utils_file import atomic_write_json
 
 class BaseItem:
+  # 子类同样声明 __slots__，实例不带 __dict__，大回归中的上万个条目占用更少内存
+  __slots__ = ()
+
   @classmethod
   def load_from_file(cls, path):
     if not os.path.exists(path) or os.path.getsize(path) == 0:
@@ -11,12 +15,76 @@ class BaseItem:
     return cls.from_dict(data)
 
   def save_to_file(self, path):
-    with open(path, "w") as f:
-      json.dump(self.to_dict(), f, indent=2, ensure_ascii=False)
+    atomic_write_json(path, self.to_dict(), indent=2, ensure_ascii=False)
 
   def to_dict(self):
     raise NotImplementedError
 
   @classmethod
   def from_dict(cls, data):
-    raise NotImplementedError
\ No newline at end of file
+    raise NotImplementedError
+
+class ItemIndex:
+  """
+  条目列表的哈希索引：按若干键函数维护 键 -> 列表下标 的映射，同一个键对应列表中最靠前的条目，
+  与按顺序线性查找的结果一致。
+
+  索引记住所索引的列表对象和长度。列表被整体替换（set_*、remove_*、clear_*）或被直接 append
+  （例如状态存储加载时）后，下次 sync 时自动重建；通过 append / replace 修改列表时增量维护。
+  键在条目加入索引时计算，之后修改条目的键字段不会反映到索引中。
+  """
+  __slots__ = ("key_funcs", "maps", "items", "size")
+
+  def __init__(self, **key_funcs):
+    self.key_funcs = key_funcs
+    self.maps = {name: {} for name in key_funcs}
+    self.items = None
+    self.size = 0
+
+  def sync(self, items):
+    """
+    确保索引与 items 一致，必要时重建。
+
+    返回:
+      ItemIndex: self，便于链式调用。
+    """
+    if items is self.items and len(items) == self.size:
+      return self
+    for key_map in self.maps.values():
+      key_map.clear()
+    self.items = items
+    self.size = 0
+    for item in items:
+      self._add(item)
+    return self
+
+  def _add(self, item):
+    pos = self.size
+    for name, key_func in self.key_funcs.items():
+      self.maps[name].setdefault(key_func(item), pos)
+    self.size += 1
+
+  def get(self, name, key):
+    """
+    返回:
+      键 name 等于 key 的第一个条目，不存在时为 None。
+    """
+    pos = self.maps[name].get(key)
+    return None if pos is None else self.items[pos]
+
+  def position(self, name, key):
+    return self.maps[name].get(key)
+
+  def append(self, item):
+    """把 item 追加到被索引的列表末尾并加入索引。"""
+    self.items.append(item)
+    self._add(item)
+
+  def replace(self, pos, item):
+    """用 item 替换列表第 pos 项；键不变时只改列表，键变化时下次 sync 重建索引。"""
+    old = self.items[pos]
+    self.items[pos] = item
+    for key_func in self.key_funcs.values():
+      if key_func(old) != key_func(item):
+        self.items = None
+        return
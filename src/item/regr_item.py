@@ -1,11 +1,21 @@
 from item.task_item import TaskItem
-from item.sim_item import SimItem
-from item.base_item import BaseItem
+from item.sim_item import SimItem, sim_dedup_key, new_sim_index
+from item.base_item import BaseItem, ItemIndex
 from constants import get_current_user, get_current_dir, get_current_time, get_current_host, VCM_REGR_FILENAME
 import json
 import os
+from operator import attrgetter
+from utils.utils_file import atomic_write_json
+
+_TASK_ID = attrgetter("task_id")
 
 class RegrItem(BaseItem):
+  __slots__ = (
+    "regr_id", "regr_type", "module_name", "module_id", "current_dir", "current_time",
+    "current_user", "current_host", "tasks", "part_name", "part_mode", "node_name",
+    "work_name", "work_url", "case_list", "sims", "_sim_index", "_task_index",
+  )
+
   def __init__(self, regr_id, regr_type, module_name, module_id=None):
     self.regr_id = regr_id
     self.regr_type = regr_type
@@ -23,9 +33,15 @@ class RegrItem(BaseItem):
     self.work_url = None
     self.case_list = None
     self.sims = []
+    self._sim_index = new_sim_index()
+    self._task_index = ItemIndex(task_id=_TASK_ID)
 
-  def to_dict(self):
-    return {
+  def to_dict(self, with_children=True):
+    """
+    参数:
+      with_children: 为 False 时不包含 tasks / sims 列表。
+    """
+    data = {
       "regr_id": self.regr_id,
       "regr_type": self.regr_type,
       "module_name": self.module_name,
@@ -40,9 +56,11 @@ class RegrItem(BaseItem):
       "work_name": self.work_name,
       "work_url": self.work_url,
       "case_list": self.case_list,
-      "tasks": [task.to_dict() for task in self.tasks] if self.tasks else [],
-      "sims": [sim.to_dict() for sim in self.sims] if self.sims else [],
     }
+    if with_children:
+      data["tasks"] = [task.to_dict() for task in self.tasks] if self.tasks else []
+      data["sims"] = [sim.to_dict() for sim in self.sims] if self.sims else []
+    return data
 
   @classmethod
   def from_dict(cls, data):
@@ -69,8 +87,7 @@ class RegrItem(BaseItem):
     return item
 
   def save_to_file(self, path=VCM_REGR_FILENAME):
-    with open(path, "w") as f:
-      json.dump(self.to_dict(), f, indent=2, ensure_ascii=False)
+    atomic_write_json(path, self.to_dict(), indent=2, ensure_ascii=False)
 
   @classmethod
   def load_from_file(cls, path=VCM_REGR_FILENAME):
@@ -112,12 +129,14 @@ class RegrItem(BaseItem):
     """添加单个 sim，支持 SimItem 或 dict"""
     if not isinstance(sim, SimItem):
       sim = SimItem.from_dict(sim)
-    # 避免重复（可按 sim_id 或 case_name, case_seed, sim_log 唯一性）
-    key = (sim.case_name, sim.case_seed, sim.sim_log)
-    for s in self.sims:
-      if (s.case_name, s.case_seed, s.sim_log) == key:
-        return
-    self.sims.append(sim)
+    # 避免重复（按 case_name, case_seed, sim_log 唯一性）
+    index = self._sim_index.sync(self.sims)
+    if index.get("key", sim_dedup_key(sim)) is None:
+      index.append(sim)
+
+  def get_sim(self, sim_id):
+    """根据 sim_id 查找 sim，不存在时返回 None"""
+    return self._sim_index.sync(self.sims).get("sim_id", sim_id)
 
   def remove_sim(self, sim_id):
     """根据 sim_id 移除 sim"""
@@ -145,26 +164,29 @@ class RegrItem(BaseItem):
   def clear_tasks(self):
     self.tasks = []
 
+  def get_task(self, task_id):
+    """根据 task_id 查找 task，不存在时返回 None"""
+    return self._task_index.sync(self.tasks).get("task_id", task_id)
+
   def add_task(self, task):
     """添加单个 task，支持 TaskItem 或 dict"""
     if not isinstance(task, TaskItem):
       task = TaskItem.from_dict(task)
     # 避免重复（可按 task_id 唯一性）
-    for t in self.tasks:
-      if t.task_id == task.task_id:
-        return
-    self.tasks.append(task)
+    index = self._task_index.sync(self.tasks)
+    if index.get("task_id", task.task_id) is None:
+      index.append(task)
 
   def update_task(self, task):
     """更新单个 task，支持 TaskItem 或 dict"""
     if not isinstance(task, TaskItem):
       task = TaskItem.from_dict(task)
-    # 避免重复（可按 task_id 唯一性）
-    for i, t in enumerate(self.tasks):
-      if t.task_id == task.task_id:
-        self.tasks[i] = task
-        return
-    self.tasks.append(task)
+    index = self._task_index.sync(self.tasks)
+    pos = index.position("task_id", task.task_id)
+    if pos is None:
+      index.append(task)
+    elif self.tasks[pos] is not task:
+      index.replace(pos, task)
 
   def remove_task(self, task_id):
     """根据 task_id 移除 task"""
@@ -1,37 +1,76 @@
-import json
 import os
+from item.base_item import ItemIndex
 from item.regr_item import RegrItem
-from constants import VCM_REGR_FILENAME
+from item.regr_state_store import JsonRegrStateStore, SqliteRegrStateStore, export_regrs_to_json
+from constants import VCM_REGR_FILENAME, VCM_REGR_STATE_FILENAME, REGR_STATE_BACKEND
 
 class RegrListItem:
-  def __init__(self, regrs=None):
+  def __init__(self, regrs=None, store=None):
     self.regrs = regrs if regrs is not None else []
+    self.store = store
+    self._regr_index = ItemIndex(regr_id=lambda regr: regr.regr_id)
+
+  @staticmethod
+  def get_state_store(path=VCM_REGR_FILENAME):
+    """
+    按 REGR_STATE_BACKEND 返回回归状态存储。
+
+    sqlite 后端的数据库与 path 放在同一目录；数据库不存在时从 path 指向的 JSON 导入。
+    """
+    if REGR_STATE_BACKEND == "sqlite":
+      db_path = os.path.join(os.path.dirname(path), VCM_REGR_STATE_FILENAME)
+      return SqliteRegrStateStore(db_path, json_path=path)
+    return JsonRegrStateStore(path)
+
+  @classmethod
+  def exists(cls, path=VCM_REGR_FILENAME):
+    return cls.get_state_store(path).exists()
+
+  @classmethod
+  def summarize(cls, path=VCM_REGR_FILENAME):
+    """
+    不加载完整回归状态，返回各回归的 RegrStatusSummary 列表。
+    """
+    return cls.get_state_store(path).summarize()
+
+  @classmethod
+  def load_todo_sims(cls, path=VCM_REGR_FILENAME):
+    """
+    流式取出待检查（TODO）的任务仿真，返回 PendingSim 列表；已是最终状态的仿真不构建 SimItem。
+    """
+    return cls.get_state_store(path).load_todo_sims()
+
+  @classmethod
+  def save_todo_sims(cls, pending_sims, path=VCM_REGR_FILENAME):
+    """
+    把 load_todo_sims 取出并更新过的仿真写回原位置，其余回归状态不变。
+    """
+    cls.get_state_store(path).save_sims(pending_sims)
 
   @classmethod
   def load_from_file(cls, path=VCM_REGR_FILENAME):
-    if not os.path.exists(path):
-      return cls()
-    with open(path, "r") as f:
-      data = json.load(f)
-    regrs = [RegrItem.from_dict(item) for item in data.get("regrs", [])]
-    return cls(regrs)
+    store = cls.get_state_store(path)
+    return cls(store.load(), store)
+
+  def save_to_file(self, path=None):
+    if path is not None or self.store is None:
+      self.store = self.get_state_store(path or VCM_REGR_FILENAME)
+    self.store.save(self.regrs)
 
-  def save_to_file(self, path=VCM_REGR_FILENAME):
-    with open(path, "w") as f:
-      json.dump({"regrs": [r.to_dict() for r in self.regrs]}, f, indent=2, ensure_ascii=False)
+  def export_to_json(self, path=VCM_REGR_FILENAME):
+    """
+    按 vcm_regr_info.json 格式导出，sqlite 后端下供其他脚本读取。
+    """
+    export_regrs_to_json(self.regrs, path)
 
   def add_regr(self, regr_item):
     # 避免重复
-    for r in self.regrs:
-      if r.regr_id == regr_item.regr_id:
-        return
-    self.regrs.append(regr_item)
+    index = self._regr_index.sync(self.regrs)
+    if index.get("regr_id", regr_item.regr_id) is None:
+      index.append(regr_item)
 
   def get_regr(self, regr_id):
-    for r in self.regrs:
-      if r.regr_id == regr_id:
-        return r
-    return None
+    return self._regr_index.sync(self.regrs).get("regr_id", regr_id)
   
   def get_regr_first(self):
     if len(self.regrs) == 0:
@@ -47,10 +86,10 @@ class RegrListItem:
     self.regrs = [r for r in self.regrs if r.regr_id != regr_id]
 
   def update_regr(self, regr_item: RegrItem):
-    for idx, r in enumerate(self.regrs):
-      if r.regr_id == regr_item.regr_id:
-        self.regrs[idx] = regr_item
-        return
+    index = self._regr_index.sync(self.regrs)
+    pos = index.position("regr_id", regr_item.regr_id)
+    if pos is not None and self.regrs[pos] is not regr_item:
+      index.replace(pos, regr_item)
 
   def get_regrs(self):
     return self.regrs
@@ -0,0 +1,231 @@
+import json
+import os
+from db_manager import open_sqlite_connection, retry_on_locked
+from utils.utils_file import atomic_write_json
+from item.regr_item import RegrItem
+from item.task_item import TaskItem
+from item.sim_item import SimItem
+from item.regr_status import (
+  summarize_regr_json, summarize_regr_rows,
+  iter_regr_json_todo_sims, iter_regr_rows_todo_sims, rewrite_regr_json_sims,
+)
+
+class JsonRegrStateStore:
+  """
+  回归状态保存为单个 JSON 文件（vcm_regr_info.json），每次保存整体重写。
+  """
+  def __init__(self, path):
+    self.path = path
+
+  def exists(self):
+    return os.path.exists(self.path)
+
+  def load(self):
+    """
+    返回:
+      list: RegrItem 列表，文件不存在时为空列表。
+    """
+    if not os.path.exists(self.path):
+      return []
+    with open(self.path, "r") as f:
+      data = json.load(f)
+    return [RegrItem.from_dict(item) for item in data.get("regrs", [])]
+
+  def save(self, regrs):
+    export_regrs_to_json(regrs, self.path)
+
+  def summarize(self):
+    """
+    返回:
+      list: 各回归的 RegrStatusSummary，流式读取文件，不构建完整的条目对象。
+    """
+    if not os.path.exists(self.path):
+      return []
+    return summarize_regr_json(self.path)
+
+  def load_todo_sims(self):
+    """
+    返回:
+      list: 待检查任务仿真的 PendingSim 列表，已是最终状态的仿真不构建对象。
+    """
+    if not os.path.exists(self.path):
+      return []
+    return list(iter_regr_json_todo_sims(self.path))
+
+  def save_sims(self, pending_sims):
+    """
+    把 PendingSim 中的仿真写回原位置，流式改写文件，不加载其他仿真。
+    """
+    if pending_sims:
+      rewrite_regr_json_sims(self.path, {p.key: p.sim.to_dict() for p in pending_sims})
+
+def export_regrs_to_json(regrs, path):
+  """
+  按 vcm_regr_info.json 格式导出回归状态。
+  """
+  atomic_write_json(path, {"regrs": [r.to_dict() for r in regrs]}, indent=2, ensure_ascii=False)
+
+class SqliteRegrStateStore:
+  """
+  回归状态保存在 SQLite 文件中，每个 RegrItem / TaskItem / SimItem 各占一行。
+
+  行主键为 (regr_ord, task_ord, sim_ord) 列表下标，不适用的位置为 -1：
+    回归 (r, -1, -1)、回归级 sim (r, -1, s)、任务 (r, t, -1)、任务 sim_logs (r, t, s)。
+  data 列为该条目去掉子列表后的 JSON。load 时记录每行 JSON，save 时只写入变化、新增的行
+  并删除多余的行，更新少量 sim 状态时只改动对应的几行。
+  """
+  def __init__(self, path, json_path=None):
+    """
+    参数:
+      path: 状态数据库路径。
+      json_path: 旧的 JSON 状态文件，数据库不存在时从该文件导入。
+    """
+    self.path = path
+    self.json_path = json_path
+    self.conn = None
+    self.snapshot = {}
+
+  def exists(self):
+    return os.path.exists(self.path) or bool(self.json_path and os.path.exists(self.json_path))
+
+  def _connect(self):
+    if self.conn is None:
+      # 回归目录可能在 NFS 上，日志模式、busy_timeout 与 vcm.db 一样由 DB_JOURNAL_MODE 等配置决定
+      self.conn = retry_on_locked(open_sqlite_connection, self.path)
+      # 由 save 显式 BEGIN IMMEDIATE / COMMIT 控制事务
+      self.conn.isolation_level = None
+      self.conn.execute('''
+        CREATE TABLE IF NOT EXISTS regr_state (
+          regr_ord INTEGER NOT NULL,
+          task_ord INTEGER NOT NULL,
+          sim_ord INTEGER NOT NULL,
+          data TEXT NOT NULL,
+          PRIMARY KEY (regr_ord, task_ord, sim_ord)
+        ) WITHOUT ROWID
+      ''')
+    return self.conn
+
+  def load(self):
+    """
+    返回:
+      list: RegrItem 列表。数据库不存在而旧 JSON 存在时，先读取 JSON，下次 save 时整体写入数据库。
+    """
+    if self._use_json():
+      self.snapshot = {}
+      return JsonRegrStateStore(self.json_path).load()
+
+    rows = self._connect().execute(
+      'SELECT regr_ord, task_ord, sim_ord, data FROM regr_state ORDER BY regr_ord, task_ord, sim_ord'
+    ).fetchall()
+    self.snapshot = {(r, t, s): data for r, t, s, data in rows}
+
+    # 拼成一个 JSON 数组一次解析，比逐行 json.loads 快
+    items = json.loads("[" + ",".join(row[3] for row in rows) + "]")
+    regrs = []
+    regr = task = None
+    for (regr_ord, task_ord, sim_ord, _), item in zip(rows, items):
+      if task_ord < 0 and sim_ord < 0:
+        regr = RegrItem.from_dict(item)
+        regrs.append(regr)
+      elif task_ord < 0:
+        regr.sims.append(SimItem.from_dict(item))
+      elif sim_ord < 0:
+        task = TaskItem.from_dict(item)
+        regr.tasks.append(task)
+      else:
+        task.sim_logs.append(SimItem.from_dict(item))
+    return regrs
+
+  def save(self, regrs):
+    """
+    在一个写事务内把与上次 load/save 不同的行写回数据库。
+
+    返回:
+      int: 写入和删除的行数。
+    """
+    rows = dict(_iter_state_rows(regrs))
+    changed = [(r, t, s, data) for (r, t, s), data in rows.items() if self.snapshot.get((r, t, s)) != data]
+    removed = [key for key in self.snapshot if key not in rows]
+
+    retry_on_locked(self._write_rows, changed, removed, replace_all=not self.snapshot)
+    self.snapshot = rows
+    return len(changed) + len(removed)
+
+  def _write_rows(self, changed, removed, replace_all=False):
+    conn = self._connect()
+    conn.execute('BEGIN IMMEDIATE')
+    try:
+      if replace_all:
+        # 首次写入（或从 JSON 导入）时清掉可能残留的旧数据
+        conn.execute('DELETE FROM regr_state')
+      conn.executemany('DELETE FROM regr_state WHERE regr_ord = ? AND task_ord = ? AND sim_ord = ?', removed)
+      conn.executemany('INSERT OR REPLACE INTO regr_state (regr_ord, task_ord, sim_ord, data) VALUES (?, ?, ?, ?)', changed)
+      conn.execute('COMMIT')
+    except Exception:
+      if conn.in_transaction:
+        conn.execute('ROLLBACK')
+      raise
+
+  def _use_json(self):
+    return not os.path.exists(self.path) and self.json_path and os.path.exists(self.json_path)
+
+  def summarize(self):
+    """
+    返回:
+      list: 各回归的 RegrStatusSummary，逐行读取数据库，不构建完整的条目对象。
+    """
+    if self._use_json():
+      return summarize_regr_json(self.json_path)
+    if not os.path.exists(self.path):
+      return []
+    return summarize_regr_rows(self._connect().execute(
+      'SELECT regr_ord, task_ord, sim_ord, data FROM regr_state ORDER BY regr_ord, task_ord, sim_ord'
+    ))
+
+  def load_todo_sims(self):
+    """
+    返回:
+      list: 待检查任务仿真的 PendingSim 列表，只读取任务行和 TODO 仿真行。
+    """
+    if self._use_json():
+      return JsonRegrStateStore(self.json_path).load_todo_sims()
+    if not os.path.exists(self.path):
+      return []
+    return list(iter_regr_rows_todo_sims(self._connect().execute(
+      """
+      SELECT regr_ord, task_ord, sim_ord, data FROM regr_state
+      WHERE task_ord >= 0 AND (sim_ord < 0 OR json_extract(data, '$.status') = 'TODO')
+      ORDER BY regr_ord, task_ord, sim_ord
+      """
+    )))
+
+  def save_sims(self, pending_sims):
+    """
+    在一个写事务内只更新 PendingSim 对应的行。
+    """
+    if not pending_sims:
+      return
+    if self._use_json():
+      JsonRegrStateStore(self.json_path).save_sims(pending_sims)
+      return
+    encode = _ROW_ENCODER.encode
+    changed = [(*p.key, encode(p.sim.to_dict())) for p in pending_sims]
+    retry_on_locked(self._write_rows, changed, [])
+
+  def close(self):
+    if self.conn is not None:
+      self.conn.close()
+      self.conn = None
+
+_ROW_ENCODER = json.JSONEncoder(ensure_ascii=False)
+
+def _iter_state_rows(regrs):
+  encode = _ROW_ENCODER.encode
+  for r, regr in enumerate(regrs):
+    yield (r, -1, -1), encode(regr.to_dict(with_children=False))
+    for s, sim in enumerate(regr.sims or []):
+      yield (r, -1, s), encode(sim.to_dict())
+    for t, task in enumerate(regr.tasks or []):
+      yield (r, t, -1), encode(task.to_dict(with_children=False))
+      for s, sim in enumerate(task.sim_logs or []):
+        yield (r, t, s), encode(sim.to_dict())
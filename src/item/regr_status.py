@@ -0,0 +1,239 @@
+"""
+回归状态的流式读取：统计每个回归 / 任务的计数和失败仿真，或只取出待检查（TODO）的仿真，
+不构建完整的 RegrItem / TaskItem / SimItem
+"""
+import json
+from item.sim_item import SimItem
+from utils.utils_file import atomic_open
+from utils.utils_json_stream import JsonStreamReader, JsonStreamWriter
+
+REGR_PATH = ("regrs", "item")
+REGR_CASE_LIST_PATH = ("regrs", "item", "case_list")
+REGR_SIM_PATH = ("regrs", "item", "sims", "item")
+TASK_PATH = ("regrs", "item", "tasks", "item")
+TASK_SIM_PATH = ("regrs", "item", "tasks", "item", "sim_logs", "item")
+
+class TaskStatusSummary:
+  __slots__ = ("task_id", "status_post", "total", "ok", "todo", "check_done", "check_pass", "check_fail")
+
+  def __init__(self):
+    self.task_id = None
+    self.status_post = "None"
+    self.total = 0
+    self.ok = 0
+    self.todo = 0
+    self.check_done = 0
+    self.check_pass = 0
+    self.check_fail = 0
+
+  def set_field(self, name, value):
+    if name in ("task_id", "status_post"):
+      setattr(self, name, value)
+
+  def add_sim(self, status, sim_result):
+    self.total += 1
+    if status == "OK":
+      self.ok += 1
+    elif status == "TODO":
+      self.todo += 1
+    elif status in ("CheckDone", "CheckFail"):
+      self.check_done += 1
+      if sim_result == "Pass":
+        self.check_pass += 1
+      elif sim_result == "Fail":
+        self.check_fail += 1
+
+class RegrStatusSummary:
+  """
+  一个回归的状态统计。
+
+  waiting 为回归级 sims 中等待分配节点（TODO）的数量，tasks 为各任务的统计，
+  fail_sims 为 sim_result 为 Fail 的任务仿真 (sim_id, case_name, case_seed, sim_log)。
+  """
+  __slots__ = ("regr_id", "module_name", "work_name", "case_list", "waiting", "tasks", "fail_sims")
+
+  def __init__(self):
+    self.regr_id = None
+    self.module_name = None
+    self.work_name = None
+    self.case_list = None
+    self.waiting = 0
+    self.tasks = []
+    self.fail_sims = []
+
+  def set_field(self, name, value):
+    if name in ("regr_id", "module_name", "work_name", "case_list"):
+      setattr(self, name, value)
+
+  def add_regr_sim(self, sim):
+    if sim.get("status", "None") == "TODO":
+      self.waiting += 1
+
+  def add_task(self):
+    task = TaskStatusSummary()
+    self.tasks.append(task)
+    return task
+
+  def add_task_sim(self, task, sim):
+    sim_result = sim.get("sim_result")
+    task.add_sim(sim.get("status", "None"), sim_result)
+    if sim_result == "Fail":
+      self.fail_sims.append((sim.get("sim_id"), sim.get("case_name"), sim.get("case_seed"), sim.get("sim_log", "None")))
+
+  @property
+  def sim_ok(self):
+    return sum(task.ok for task in self.tasks)
+
+  @property
+  def sim_todo(self):
+    return sum(task.todo for task in self.tasks)
+
+  @property
+  def check_done(self):
+    return sum(task.check_done for task in self.tasks)
+
+  @property
+  def check_pass(self):
+    return sum(task.check_pass for task in self.tasks)
+
+  @property
+  def check_fail(self):
+    return sum(task.check_fail for task in self.tasks)
+
+class PendingSim:
+  """
+  一个待检查的任务仿真。
+
+  key 为 (regr_ord, task_ord, sim_ord) 列表下标，与 SqliteRegrStateStore 的行主键相同，写回时按它定位；
+  post_flag 为所属任务是否为 post 仿真。
+  """
+  __slots__ = ("key", "post_flag", "sim")
+
+  def __init__(self, key, post_flag, sim: SimItem):
+    self.key = key
+    self.post_flag = post_flag
+    self.sim = sim
+
+def task_post_flag(status_post):
+  return status_post not in ("False", "None")
+
+def _iter_regr_json_events(path):
+  with open(path, "r", encoding="utf-8") as f:
+    reader = JsonStreamReader(f, decode_paths=(REGR_CASE_LIST_PATH, REGR_SIM_PATH, TASK_SIM_PATH))
+    yield from reader.iter_events()
+
+def summarize_regr_json(path):
+  """
+  流式读取 vcm_regr_info.json 并统计各回归的仿真状态，内存占用与文件大小无关。
+
+  返回:
+    list: RegrStatusSummary 列表。
+  """
+  summaries = []
+  regr = task = None
+  for prefix, event, value in _iter_regr_json_events(path):
+    if event == "value":
+      if prefix == TASK_SIM_PATH:
+        regr.add_task_sim(task, value)
+      elif prefix == REGR_SIM_PATH:
+        regr.add_regr_sim(value)
+      elif prefix[:-1] == TASK_PATH:
+        task.set_field(prefix[-1], value)
+      elif prefix[:-1] == REGR_PATH:
+        regr.set_field(prefix[-1], value)
+    elif event == "start_map":
+      if prefix == REGR_PATH:
+        regr = RegrStatusSummary()
+        summaries.append(regr)
+      elif prefix == TASK_PATH:
+        task = regr.add_task()
+  return summaries
+
+def summarize_regr_rows(rows):
+  """
+  由 SqliteRegrStateStore 的 (regr_ord, task_ord, sim_ord, data) 行统计仿真状态，行须按主键排序。
+
+  返回:
+    list: RegrStatusSummary 列表。
+  """
+  summaries = []
+  regr = task = None
+  for _, task_ord, sim_ord, data in rows:
+    item = json.loads(data)
+    if task_ord < 0 and sim_ord < 0:
+      regr = RegrStatusSummary()
+      for name, value in item.items():
+        regr.set_field(name, value)
+      summaries.append(regr)
+    elif task_ord < 0:
+      regr.add_regr_sim(item)
+    elif sim_ord < 0:
+      task = regr.add_task()
+      for name, value in item.items():
+        task.set_field(name, value)
+    else:
+      regr.add_task_sim(task, item)
+  return summaries
+
+def iter_regr_json_todo_sims(path):
+  """
+  流式读取 vcm_regr_info.json，只为 status 为 TODO 的任务仿真构建 SimItem。
+
+  返回:
+    generator: PendingSim，按文件中的顺序。
+  """
+  regr_ord = task_ord = sim_ord = -1
+  status_post = "False"
+  for prefix, event, value in _iter_regr_json_events(path):
+    if event == "value":
+      if prefix == TASK_SIM_PATH:
+        sim_ord += 1
+        if value.get("status", "None") == "TODO":
+          yield PendingSim((regr_ord, task_ord, sim_ord), task_post_flag(status_post), SimItem.from_dict(value))
+      elif prefix == TASK_PATH + ("status_post",):
+        # TaskItem.to_dict 把标量字段写在 sim_logs 之前，读到仿真时已知所属任务的 status_post
+        status_post = value
+    elif event == "start_map":
+      if prefix == REGR_PATH:
+        regr_ord += 1
+        task_ord = -1
+      elif prefix == TASK_PATH:
+        task_ord += 1
+        sim_ord = -1
+        status_post = "False"
+
+def rewrite_regr_json_sims(path, updates):
+  """
+  流式改写 vcm_regr_info.json 中指定的任务仿真，其余内容原样写出，写入过程是原子的。
+
+  参数:
+    path: 回归状态 JSON 文件。
+    updates: {(regr_ord, task_ord, sim_ord): sim dict}。
+  """
+  regr_ord = task_ord = sim_ord = -1
+  with atomic_open(path, "w", encoding="utf-8") as out:
+    writer = JsonStreamWriter(out, indent=2, ensure_ascii=False)
+    for prefix, event, value in _iter_regr_json_events(path):
+      if event == "value" and prefix == TASK_SIM_PATH:
+        sim_ord += 1
+        value = updates.get((regr_ord, task_ord, sim_ord), value)
+      elif event == "start_map":
+        if prefix == REGR_PATH:
+          regr_ord += 1
+          task_ord = -1
+        elif prefix == TASK_PATH:
+          task_ord += 1
+          sim_ord = -1
+      writer.write_event(prefix, event, value)
+
+def iter_regr_rows_todo_sims(rows):
+  """
+  由 SqliteRegrStateStore 的任务行和 TODO 仿真行构建 PendingSim，行须按主键排序。
+  """
+  status_post = "False"
+  for regr_ord, task_ord, sim_ord, data in rows:
+    item = json.loads(data)
+    if sim_ord < 0:
+      status_post = item.get("status_post", "False")
+    else:
+      yield PendingSim((regr_ord, task_ord, sim_ord), task_post_flag(status_post), SimItem.from_dict(item))
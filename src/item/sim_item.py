@@ -1,9 +1,32 @@
-from item.base_item import BaseItem
+from item.base_item import BaseItem, ItemIndex
 import json
 import os
+import sys
+from operator import attrgetter
+from utils.utils_file import atomic_write_json
 from constants import get_current_time
 
+_SIM_ID = attrgetter("sim_id")
+_JOB_ID = attrgetter("job_id")
+
+def _intern(value):
+  # 状态、用例名、创建时间等字段在一个回归中大量重复，驻留后所有 SimItem 共用同一个字符串
+  return sys.intern(value) if isinstance(value, str) else value
+
+def sim_dedup_key(sim):
+  """sim 的去重键 (case_name, case_seed, sim_log)。"""
+  return (sim.case_name, sim.case_seed, sim.sim_log)
+
+def new_sim_index():
+  """按 sim_id、job_id 和去重键索引 sim 列表。"""
+  return ItemIndex(sim_id=_SIM_ID, job_id=_JOB_ID, key=sim_dedup_key)
+
 class SimItem(BaseItem):
+  __slots__ = (
+    "sim_id", "case_name", "case_seed", "job_id", "job_status",
+    "status", "sim_log", "sim_result", "created_time",
+  )
+
   def __init__(self, 
     sim_id, case_name, case_seed, 
     job_id, job_status="None",
@@ -36,14 +59,14 @@ class SimItem(BaseItem):
   def from_dict(cls, data):
     return cls(
       sim_id=data.get("sim_id"),
-      case_name=data.get("case_name"),
+      case_name=_intern(data.get("case_name")),
       case_seed=data.get("case_seed"),
       job_id=data.get("job_id"),
-      job_status=data.get("job_status", "None"),
-      status=data.get("status", "None"),
+      job_status=_intern(data.get("job_status", "None")),
+      status=_intern(data.get("status", "None")),
       sim_log=data.get("sim_log", "None"),
-      sim_result=data.get("sim_result"),
-      created_time=data.get("created_time")
+      sim_result=_intern(data.get("sim_result")),
+      created_time=_intern(data.get("created_time"))
     )
 
   @classmethod
@@ -56,8 +79,7 @@ class SimItem(BaseItem):
 
   @classmethod
   def save_to_file(cls, file_path, sim_logs):
-    with open(file_path, "w") as f:
-      json.dump({"sim_logs": [log.to_dict() for log in sim_logs]}, f, indent=2)
+    atomic_write_json(file_path, {"sim_logs": [log.to_dict() for log in sim_logs]}, indent=2)
 
   @staticmethod
   def exists(sim_logs, case_name, case_seed, sim_log):
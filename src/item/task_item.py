@@ -1,11 +1,17 @@
 from typing import List, Optional
-from item.sim_item import SimItem
+from item.sim_item import SimItem, sim_dedup_key, new_sim_index
 from item.base_item import BaseItem
 from constants import get_current_user, get_current_dir, get_current_time, get_current_host, VCM_TASK_FILENAME
 import json
 import os
+from utils.utils_file import atomic_write_json
 
 class TaskItem(BaseItem):
+  __slots__ = (
+    "task_id", "status_post", "status_regr", "status_check", "git_de", "git_dv",
+    "comp_log_time", "current_user", "current_host", "sim_logs", "_sim_index",
+  )
+
   def __init__(
     self,
     task_id=None,
@@ -29,6 +35,7 @@ class TaskItem(BaseItem):
     self.current_user = current_user if current_user is not None else get_current_user()
     self.current_host = current_host if current_host is not None else get_current_host()
     self.sim_logs = sim_logs if sim_logs is not None else []
+    self._sim_index = new_sim_index()
 
   @classmethod
   def load_from_file(cls, file_path = VCM_TASK_FILENAME):
@@ -42,11 +49,14 @@ class TaskItem(BaseItem):
     return cls()
 
   def save_to_file(self, file_path = VCM_TASK_FILENAME):
-    with open(file_path, "w") as f:
-      json.dump(self.to_dict(), f, indent=2)
+    atomic_write_json(file_path, self.to_dict(), indent=2)
 
-  def to_dict(self):
-    return {
+  def to_dict(self, with_children=True):
+    """
+    参数:
+      with_children: 为 False 时不包含 sim_logs 列表。
+    """
+    data = {
       "task_id": self.task_id,
       "status_post": self.status_post,
       "status_regr": self.status_regr,
@@ -56,8 +66,10 @@ class TaskItem(BaseItem):
       "comp_log_time": self.comp_log_time,
       "current_user": self.current_user,
       "current_host": self.current_host,
-      "sim_logs": [log.to_dict() for log in self.sim_logs]
     }
+    if with_children:
+      data["sim_logs"] = [log.to_dict() for log in self.sim_logs]
+    return data
   
   @staticmethod
   def from_dict(data: dict):
@@ -69,27 +81,24 @@ class TaskItem(BaseItem):
       git_de=data.get("git_de", "None"),
       git_dv=data.get("git_dv", "None"),
       comp_log_time=data.get("comp_log_time"),
-      current_user=data.get("current_user", get_current_user()),
-      current_host=data.get("current_host", get_current_host()),
+      # 缺省时由 __init__ 取当前用户/主机（进程内缓存）
+      current_user=data.get("current_user"),
+      current_host=data.get("current_host"),
       sim_logs=[SimItem.from_dict(item) for item in data.get("sim_logs", [])]
     )
 
+  def _sims(self):
+    """返回与 sim_logs 同步的索引"""
+    return self._sim_index.sync(self.sim_logs)
+
   def update_sim_logs(self, new_logs: list):
     # 合并去重
-    #print(f"[VCM] Merging new sim logs into existing logs.")
-    # 读取现有的 sim_logs
-    #print(f"[VCM] Existing sim logs: {self.sim_logs}")
-    existing = { (log.case_name, log.case_seed, log.sim_log) for log in self.sim_logs }
+    index = self._sims()
     for log in new_logs:
-      #print(f"[VCM] Processing new log: {log}")
-      key = (log.case_name, log.case_seed, log.sim_log)
-      if key not in existing:
-        self.sim_logs.append(log)
-        existing.add(key)
+      if index.get("key", sim_dedup_key(log)) is None:
+        index.append(log)
       else:
         print(f"[VCM] Duplicate log found, skipping: {log.to_dict()}")
-        pass
-    #print(f"[VCM] Updated sim logs: {self.sim_logs}")
 
   def get_post_status(self):
     if self.status_post == "False" or self.status_post == "None":
@@ -122,11 +131,18 @@ class TaskItem(BaseItem):
     if not isinstance(sim, SimItem):
       sim = SimItem.from_dict(sim)
     # 避免重复
-    key = (sim.case_name, sim.case_seed, sim.sim_log)
-    for log in self.sim_logs:
-      if (log.case_name, log.case_seed, log.sim_log) == key:
-        return  # 已存在则不添加
-    self.sim_logs.append(sim)
+    index = self._sims()
+    if index.get("key", sim_dedup_key(sim)) is None:
+      index.append(sim)
+
+  def get_sim(self, sim_id):
+    """根据 sim_id 查找 sim_log，不存在时返回 None"""
+    return self._sims().get("sim_id", sim_id)
+
+  def has_sim(self, sim_id, job_id):
+    """sim_logs 中是否已有相同 sim_id 或 job_id 的 sim"""
+    index = self._sims()
+    return index.get("sim_id", sim_id) is not None or index.get("job_id", job_id) is not None
 
   def remove_sim(self, sim_id):
     """根据 sim_id 移除 sim_log"""
@@ -1,5 +1,6 @@
 from base_manager import BaseManager
 from project.project_manager import ProjectManager
+from db_context import get_db_context
 
 class ModuleManager(BaseManager):
   def add_module(self, module_name: str, project_id: int, created_by: str):
@@ -20,6 +21,7 @@ class ModuleManager(BaseManager):
       VALUES (?, ?, ?)
       ''', (module_name, project_id, created_by)
     )
+    get_db_context(self.cursor).clear_module_cache()
     return
   
   def exist_module(self, module_name: str):
@@ -41,7 +43,7 @@ class ModuleManager(BaseManager):
 
   def find_module_id_by_name(self, module_name: str):
     """
-    根据模块名称查找模块ID。
+    根据模块名称查找模块ID，结果在本次命令内缓存。
 
     参数:
       module_name (str): 模块名称。
@@ -49,17 +51,23 @@ class ModuleManager(BaseManager):
     返回:
       int or None: 模块ID，未找到返回 None。
     """
+    module_ids = get_db_context(self.cursor).module_ids
+    if module_name in module_ids:
+      return module_ids[module_name]
     self.cursor.execute(
       '''
       SELECT module_id FROM modules WHERE module_name = ?
       ''', (module_name,)
     )
     module_id = self.cursor.fetchone()
-    return module_id[0] if module_id else None
+    if not module_id:
+      return None
+    module_ids[module_name] = module_id[0]
+    return module_id[0]
 
   def find_module_name_by_id(self, module_id: int):
     """
-    根据模块ID查找模块名称。
+    根据模块ID查找模块名称，结果在本次命令内缓存。
 
     参数:
       module_id (int): 模块ID。
@@ -67,13 +75,19 @@ class ModuleManager(BaseManager):
     返回:
       str or None: 模块名称，未找到返回 None。
     """
+    module_names = get_db_context(self.cursor).module_names
+    if module_id in module_names:
+      return module_names[module_id]
     self.cursor.execute(
       '''
       SELECT module_name FROM modules WHERE module_id = ?
       ''', (module_id,)
     )
     module_name = self.cursor.fetchone()
-    return module_name[0] if module_name else None
+    if not module_name:
+      return None
+    module_names[module_id] = module_name[0]
+    return module_name[0]
 
   def update_module_name(self, old_module_name: str, new_module_name: str):
     """
@@ -91,6 +105,7 @@ class ModuleManager(BaseManager):
       UPDATE modules SET module_name = ? WHERE module_name = ?
       ''', (new_module_name, old_module_name)
     )
+    get_db_context(self.cursor).clear_module_cache()
 
   def delete_module(self, module_name: str):
     """
@@ -108,6 +123,7 @@ class ModuleManager(BaseManager):
       DELETE FROM modules WHERE module_name = ?
       ''', (module_name,)
     )
+    get_db_context(self.cursor).clear_module_cache()
 
   def get_modules_by_project(self, project_id: int):
     """
@@ -127,6 +143,27 @@ class ModuleManager(BaseManager):
     )
     return self.cursor.fetchall()
   
+  def get_modules_with_project_name(self, project_id: int):
+    """
+    获取指定项目下的所有模块，第三列为项目名称而非项目ID。
+
+    参数:
+      project_id (int): 项目ID。
+
+    返回:
+      list: 模块信息的元组列表，列顺序与 modules 表一致。
+    """
+
+    self.cursor.execute(
+      '''
+      SELECT m.module_id, m.module_name, p.project_name, m.created_at, m.created_by
+      FROM modules m
+      LEFT JOIN projects p ON m.project_id = p.project_id
+      WHERE m.project_id = ?
+      ''', (project_id,)
+    )
+    return self.cursor.fetchall()
+
   def get_all_modules(self):
     """
     获取所有模块信息。
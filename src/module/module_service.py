@@ -2,13 +2,14 @@ from module.module_manager import ModuleManager
 from project.project_manager import ProjectManager
 from utils.utils_git import get_module_name
 from constants import *
+from db_context import get_manager
 
 class ModuleService:
   def __init__(self, cursor, logger):
     self.cursor = cursor
     self.logger = logger
-    self.manager = ModuleManager(cursor)
-    self.project_manager = ProjectManager(cursor)
+    self.manager = get_manager(cursor, ModuleManager)
+    self.project_manager = get_manager(cursor, ProjectManager)
     
 
   def add_module(self, project_name: str, module_name: str):
@@ -42,7 +43,7 @@ class ModuleService:
     if not project_id:
       print(f"Project '{project_name}' not found.")
       return []
-    modules = self.manager.get_modules_by_project(project_id)
+    modules = self.manager.get_modules_with_project_name(project_id)
     return modules
 
   def delete_module(self):
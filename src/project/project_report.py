@@ -1,6 +1,5 @@
 from tabulate import tabulate
-from constants import get_real_time
-from utils.utils_format import fetch_with_headers, print_table
+from utils.utils_format import fetch_with_headers, print_table, format_display_rows
 
 def generate_project_report(cursor, project_name: str):
   """
@@ -59,13 +58,5 @@ def print_projects_table(projects):
     return
 
   headers = ["ID", "Project", "Created at", "Created by"]
-  processed_projects = []
-  for row in projects:
-    row = list(row)
-    try:
-      row[2] = get_real_time(row[2])
-    except Exception:
-      pass
-    processed_projects.append([str(row[i]) for i in range(4)])
-
-  print_table(headers, processed_projects)
\ No newline at end of file
+  kinds = [None, None, "time", None]
+  print_table(headers, format_display_rows(projects, kinds))
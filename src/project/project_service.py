@@ -1,6 +1,7 @@
 from project.project_manager import ProjectManager
 from project.project_report import generate_project_report
 from constants import AUTH_CODE, get_current_user
+from db_context import get_manager
 
 class ProjectService:
   """
@@ -8,7 +9,7 @@ class ProjectService:
   """
   def __init__(self, cursor, logger):
     self.cursor = cursor
-    self.manager = ProjectManager(cursor)
+    self.manager = get_manager(cursor, ProjectManager)
     self.logger = logger
 
   def add_project(self, project_name):
@@ -1,6 +1,6 @@
 from regr.regr_service import RegrService
 from utils.utils_git import get_module_name
-from constants import get_current_dir
+from constants import get_current_dir, VCM_REGR_FILENAME
 from regr.regr_report import print_regrs_table
 
 class RegrCLI:
@@ -54,6 +54,13 @@ class RegrCLI:
           ("module_name", "Module name", {"nargs": "?"})
         ]
       },
+      "export_state": {
+        "help": "Export the regression state to a vcm_regr_info.json style file.",
+        "usage": "%(prog)s [json_path]",
+        "arguments": [
+          ("json_path", "Output JSON path", {"nargs": "?", "default": VCM_REGR_FILENAME})
+        ]
+      },
       "del": {
         "help": "Delete a regression record.",
         "usage": "%(prog)s <regr_id> [module_name]",
@@ -103,6 +110,8 @@ class RegrCLI:
         print_regrs_table(self.cursor,regrs)
       else:
         print("[VCM] No regression records found.")
+    elif args.subcommand == 'export_state':
+      self.service.export_state(args.json_path)
     elif args.subcommand == 'del':
       self.service.delete(int(args.regr_id), module_name)
     else:
@@ -1,5 +1,6 @@
 from module.module_manager import ModuleManager
 from base_manager import BaseManager
+from db_context import get_manager
 
 class RegrManager(BaseManager):
   def __init__(self, cursor):
@@ -10,7 +11,7 @@ class RegrManager(BaseManager):
       cursor: 数据库游标对象，用于执行 SQL 操作。
     """
     self.cursor = cursor
-    self.module_manager = ModuleManager(cursor)
+    self.module_manager = get_manager(cursor, ModuleManager)
 
   def add_regr(self, module_id: int, created_by: str, regr_base: str, regr_type: str) -> None:
     """
@@ -87,6 +88,25 @@ class RegrManager(BaseManager):
     self.cursor.execute('SELECT * FROM regr_info WHERE module_id = ?', (module_id,))
     return self.cursor.fetchall()
 
+  def list_regrs_with_module_name(self, module_id: int) -> list:
+    """
+    列出指定模块下的所有回归记录，第二列为模块名称而非模块ID。
+
+    参数:
+      module_id (int): 模块ID。
+
+    返回:
+      list: 回归记录列表，列顺序与 regr_info 表一致。
+    """
+    self.cursor.execute('''
+      SELECT r.regr_id, m.module_name, r.created_at, r.created_by, r.regr_base, r.regr_type,
+             r.part_name, r.part_mode, r.node_name, r.work_name, r.work_url, r.case_list
+      FROM regr_info r
+      LEFT JOIN modules m ON r.module_id = m.module_id
+      WHERE r.module_id = ?
+    ''', (module_id,))
+    return self.cursor.fetchall()
+
   def delete_regr(self, regr_id: int) -> None:
     """
     删除指定回归记录。
@@ -1,9 +1,11 @@
 from regr.regr_manager import RegrManager
 from module.module_manager import ModuleManager
-from constants import get_current_user
+from constants import get_current_user, VCM_REGR_FILENAME
 from item.regr_item import RegrItem
 from item.regr_list_item import RegrListItem
 from utils.utils_log import Logger
+from db_context import get_manager
+from utils.utils_file import with_file_lock
 
 class RegrService:
   def __init__(self, cursor, logger: Logger):
@@ -16,9 +18,10 @@ class RegrService:
     """
     self.cursor = cursor
     self.logger = logger
-    self.manager = RegrManager(cursor)
-    self.module_manager = ModuleManager(cursor)
+    self.manager = get_manager(cursor, RegrManager)
+    self.module_manager = get_manager(cursor, ModuleManager)
 
+  @with_file_lock(VCM_REGR_FILENAME)
   def add_regr(self,regr_base: str,  regr_type: str, module_name: str, ) -> None:
     """
     添加回归记录。
@@ -48,6 +51,7 @@ class RegrService:
     regr_list.add_regr(regr_item)
     regr_list.save_to_file()
 
+  @with_file_lock(VCM_REGR_FILENAME)
   def update_slurm_info(self, part_name: str, part_mode: str,
                         node_name: str, work_name: str, work_url: str,
                         case_list: str, module_name: str) -> None:
@@ -138,7 +142,7 @@ class RegrService:
       list: 回归记录列表。
     """
     module_id = self.module_manager.find_module_id_by_name(module_name)
-    regrs = self.manager.list_regrs_by_module(module_id)
+    regrs = self.manager.list_regrs_with_module_name(module_id)
     if regrs:
       self.logger.log(f"Listed regrs for module '{module_name}'.", level="INFO")
     else:
@@ -163,4 +167,18 @@ class RegrService:
     self.manager.delete_regr(regr_id)
     self.logger.log(f"Regr '{regr_id}' deleted from module '{module_name}'.", level="INFO")
     return True
-  
\ No newline at end of file
+  
+
+  def export_state(self, json_path: str):
+    """
+    将当前回归状态导出为 vcm_regr_info.json 格式。
+
+    参数:
+      json_path (str): 导出文件路径。
+    """
+    if not RegrListItem.exists():
+      self.logger.log("No regression list file found.", level="ERROR")
+      return
+    regr_list = RegrListItem.load_from_file()
+    regr_list.export_to_json(json_path)
+    self.logger.log(f"Regression state exported to '{json_path}'.", level="INFO")
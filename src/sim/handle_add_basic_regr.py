@@ -1,4 +1,5 @@
 import os
+import sqlite3
 from constants import VCM_REGR_FILENAME
 from case.case_manager import CaseManager
 from sim.sim_manager import SimManager
@@ -7,6 +8,8 @@ from item.sim_item import SimItem
 from item.regr_list_item import RegrListItem
 from utils.utils_case import get_cases_name_from_list
 from utils.utils_log import Logger
+from db_context import get_manager
+from utils.utils_file import with_file_lock
 
 def get_regr_log_name(status_log_path = "status.log", reg_info_log_path = "log/reg_info.log"):
   merged_data = []
@@ -49,9 +52,10 @@ def get_regr_log_name(status_log_path = "status.log", reg_info_log_path = "log/r
 
   return merged_data
 
+@with_file_lock(VCM_REGR_FILENAME)
 def handle_add_basic_regr(cursor, loger:Logger, args):
-  sim_manager = SimManager(cursor)
-  case_manager = CaseManager(cursor)
+  sim_manager = get_manager(cursor, SimManager)
+  case_manager = get_manager(cursor, CaseManager)
 
   regr_items: list[RegrItem] = []
 
@@ -61,8 +65,8 @@ def handle_add_basic_regr(cursor, loger:Logger, args):
     print(f"[VCM] Error: Current directory '{current_dir}' is not 'slurm/regr'.")
     return
   
-  # 检查是否有 VCM_REGR_FILENAME
-  if not os.path.exists(VCM_REGR_FILENAME):
+  # 检查是否有回归状态文件
+  if not RegrListItem.exists():
     print(f"[VCM] Error: File '{VCM_REGR_FILENAME}' not found.")
     return
   else:
@@ -77,7 +81,7 @@ def handle_add_basic_regr(cursor, loger:Logger, args):
     regr_item.clear_sims()
 
     # get case list
-    caselist_names = get_cases_name_from_list(regr_case_list)
+    caselist_names = set(get_cases_name_from_list(regr_case_list))
 
     case_names = get_regr_log_name()
     if not case_names:
@@ -90,29 +94,37 @@ def handle_add_basic_regr(cursor, loger:Logger, args):
         print(f"[VCM] Error: Case name '{case_name}' not found in case list.")
         return
 
-    for case_item in case_names:
-      job_id, case_name, case_seed = case_item
-      # 检查 case_name 是否存在
-      if not case_manager.exist_case(case_name, regr_item.module_id):
+    # 一次查询模块下所有用例ID，先校验全部用例再批量插入
+    case_id_map = case_manager.find_case_ids_by_module_id(regr_item.module_id)
+    sim_rows = []
+    sim_keys = []
+    seen = set()
+    for job_id, case_name, case_seed in case_names:
+      case_id = case_id_map.get(case_name)
+      if not case_id:
         print(f"[VCM] Error: Case '{case_name}' not found in module '{regr_item.module_name}'.")
         return
-      else:
-        case_id = case_manager.find_case_id_by_module_id(case_name, regr_item.module_id)
-        if not case_id:
-          print(f"[VCM] Error: Case ID for '{case_name}' not found.")
-          return
-        
-        #create sim 
-        sim_id = sim_manager.add_sim_basic_regr(case_id, job_id, case_seed, current_user)
-
-        if not sim_id:
-          print(f"[VCM] Error: Failed to add simulation for case '{case_name}'.")
-          return
-
-        # 创建 SimItem 并加入 regr_item.sims
-        sim_log_path = "None"
-        sim_item = SimItem(sim_id, case_name, case_seed, job_id, sim_log_path)
-        regr_item.add_sim(sim_item)
+      if (case_name, case_seed) in seen:
+        print(f"[VCM] Warning: Duplicate case '{case_name}' seed '{case_seed}', skipping.")
+        continue
+      seen.add((case_name, case_seed))
+      sim_rows.append((case_id, job_id, case_seed))
+      sim_keys.append((job_id, case_name, case_seed))
+
+    #create sim
+    try:
+      sim_ids = sim_manager.add_sims_basic_regr(sim_rows, current_user)
+    except (sqlite3.Error, RuntimeError) as e:
+      cursor.connection.rollback()
+      print(f"[VCM] Error: Failed to add simulations: {e}")
+      return
+
+    # 创建 SimItem 并加入 regr_item.sims
+    sim_log_path = "None"
+    regr_item.set_sims([
+      SimItem(sim_id, case_name, case_seed, job_id, sim_log_path)
+      for sim_id, (job_id, case_name, case_seed) in zip(sim_ids, sim_keys)
+    ])
     print(f"[VCM] Successfully added basic regression for {len(regr_item.sims)} cases.")
     regr_list.update_regr(regr_item)
 
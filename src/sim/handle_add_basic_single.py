@@ -6,16 +6,20 @@ from case.case_manager import CaseManager
 from constants import *
 from utils.utils_git import get_module_name
 from utils.utils_case import find_case_sw_info, find_case_hw_info
+from utils.utils_scan import resolve_log_path
 from constants import get_current_user, get_current_dir
 from item.sim_item import SimItem
 from item.task_item import TaskItem
 from sim.handle_sim_time_pass import process_single_sim_info
 from utils.utils_log import Logger
+from db_context import get_manager
+from utils.utils_file import with_file_lock
 
+@with_file_lock(VCM_TASK_FILENAME)
 def handle_add_basic_single(cursor, logger:Logger, args):
-  module_manager = ModuleManager(cursor)
-  case_manager = CaseManager(cursor)
-  sim_manager = SimManager(cursor)
+  module_manager = get_manager(cursor, ModuleManager)
+  case_manager = get_manager(cursor, CaseManager)
+  sim_manager = get_manager(cursor, SimManager)
 
   current_user = get_current_user()
   current_dir = get_current_dir()
@@ -30,7 +34,7 @@ def handle_add_basic_single(cursor, logger:Logger, args):
   
   # check sim_log file is valid
   sim_log_path = os.path.join(current_dir, args.sim_log_path)
-  if not os.path.exists(sim_log_path):
+  if not resolve_log_path(sim_log_path):
     logger.log(f"Sim log file '{sim_log_path}' not found.", level="ERROR")
     return
 
@@ -52,8 +56,7 @@ def handle_add_basic_single(cursor, logger:Logger, args):
   case_id = case_manager.find_case_id_by_module_id(case_name, module_id)
   if not case_id:
     logger.log(f"Case '{case_name}' does not exist under module '{module_name}'.", level="ERROR")
-    case_manager.add_case_basic(case_name, module_id, current_user)
-    case_id = case_manager.find_case_id_by_module_id(case_name, module_id)
+    case_id = case_manager.add_case_basic(case_name, module_id, current_user)
     group_name, case_c_name = find_case_sw_info(case_name)
     if not group_name or not case_c_name:
       logger.log(f"Case '{case_name}' not found in case_info.", level="ERROR")
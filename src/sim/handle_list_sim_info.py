@@ -5,11 +5,12 @@ from case.case_manager import CaseManager
 from sim.sim_manager import SimManager
 from utils.utils_format import generate_html_report_with_chart
 from utils.utils_git import get_project_name, get_module_name
+from db_context import get_manager
 
 def handle_list_sim_info(cursor, args):
-  case_manager = CaseManager(cursor)
-  sim_manager = SimManager(cursor)
-  module_manager = ModuleManager(cursor)
+  case_manager = get_manager(cursor, CaseManager)
+  sim_manager = get_manager(cursor, SimManager)
+  module_manager = get_manager(cursor, ModuleManager)
 
   project_name = get_project_name(args)
   module_name = get_module_name(args)
@@ -1,25 +1,79 @@
 
 import os
+from itertools import groupby
+from concurrent.futures import ProcessPoolExecutor
 from sim.sim_manager import SimManager
-from item.regr_item import RegrItem
-from item.task_item import TaskItem
-from item.sim_item import SimItem
-from utils.utils_env import check_sim_single_function_result, check_sim_single_timing_result
-import subprocess
+from utils.utils_env import check_sim_single_scan
+from utils.utils_scan import LogScanStateStore
+from constants import VCM_SCAN_FILENAME, VCM_REGR_FILENAME
+from utils.utils_file import with_file_lock
+from utils.utils_env import get_job_elapsed_time, prefetch_jobs_info
 from utils.utils_log import Logger
 from item.regr_list_item import RegrListItem
+from item.regr_status import PendingSim
 from sim.sim_manager import SimManager
-
-def process_single_sim_info(logger:Logger, args, sim_manager: SimManager, sim_info, post_flag):
+from db_context import get_manager
+
+def check_sim_log(sim_id, sim_log, post_flag, scan_state=None):
+  """
+  解析仿真日志，统计功能错误数和时序违例数。不访问数据库，可在子进程中执行。
+
+  参数:
+    sim_id: 仿真ID。
+    sim_log: 仿真日志路径。
+    post_flag: 是否为 post 仿真（需要检查时序）。
+    scan_state: 上次扫描的断点状态（可选），提供时只扫描新追加的内容。
+
+  返回:
+    tuple: (sim_id, error_num, timing_num, scan_state)
+  """
+  fun_result, tim_result, new_state = check_sim_single_scan(sim_log, timing_check=post_flag, scan_state=scan_state)
+  return sim_id, fun_result, tim_result, new_state
+
+def check_sim_logs(sim_entries, jobs):
+  """
+  使用进程池并行解析多个仿真日志。
+
+  参数:
+    sim_entries: (sim_id, sim_log, post_flag, scan_state) 列表。
+    jobs: 并行进程数。
+
+  返回:
+    list: 与 sim_entries 顺序一致的 (sim_id, error_num, timing_num, scan_state) 列表。
+  """
+  if not sim_entries:
+    return []
+  sim_ids, sim_logs, post_flags, scan_states = zip(*sim_entries)
+  with ProcessPoolExecutor(max_workers=jobs) as executor:
+    return list(executor.map(check_sim_log, sim_ids, sim_logs, post_flags, scan_states))
+
+def process_single_sim_info(logger:Logger, args, sim_manager: SimManager, sim_info, post_flag, scan_store: LogScanStateStore=None):
+  sim_log = sim_info.get("sim_log")
+  scan_state = scan_store.get(sim_log) if scan_store else None
+  _, fun_result, tim_result, new_state = check_sim_log(sim_info.get("sim_id"), sim_log, post_flag, scan_state)
+  if scan_store:
+    scan_store.set(sim_log, new_state)
+  return apply_sim_check_result(logger, args, sim_manager, sim_info, fun_result, tim_result)
+
+def apply_sim_check_result(logger:Logger, args, sim_manager: SimManager, sim_info, fun_result, tim_result):
+  """
+  根据日志检查结果更新数据库和 sim_info。
+
+  参数:
+    logger: 日志记录对象。
+    args: 命令行参数对象。
+    sim_manager: SimManager 实例。
+    sim_info: SimItem 的 dict。
+    fun_result: 功能错误数。
+    tim_result: 时序违例数。
+
+  返回:
+    dict: 更新后的 sim_info。
+  """
   sim_id = sim_info.get("sim_id")
   job_id = sim_info.get("job_id")
   sim_log = sim_info.get("sim_log")
 
-  tim_result = 0
-  fun_result = check_sim_single_function_result(sim_log)
-  if post_flag:
-    tim_result = check_sim_single_timing_result(sim_log)
-
   if fun_result is None or tim_result is None:
     logger.log(f"sim_id '{sim_id}' has no function or timing result, skipping.", level="WARNING")
     sim_info["status"] = "CheckFail"
@@ -32,7 +86,7 @@ def process_single_sim_info(logger:Logger, args, sim_manager: SimManager, sim_in
 
 
   if job_id == 0 or job_id is None:
-    if args.sim_time is None:
+    if getattr(args, "sim_time", None) is None:
       logger.log(f"sim_time is not provided for sim_id '{sim_id}'.", level="ERROR")
       sim_time = 0
     else:
@@ -64,81 +118,63 @@ def process_single_sim_info(logger:Logger, args, sim_manager: SimManager, sim_in
     logger.log(f"sim_id '{sim_id}' has error in function or timing result. at {sim_log}", level="ERROR")
   return sim_info
 
-def get_job_elapsed_time(job_id):
-  # 调用 sacct 命令
-  result = subprocess.run(
-    ['sacct', '-j', str(job_id), '--format=Elapsed', '--noheader'],
-    stdout=subprocess.PIPE,
-    stderr=subprocess.PIPE,
-    universal_newlines=True  # 替换 text=True
-  )
-
-  # 获取输出并处理，只取第一行
-  elapsed_time = result.stdout.strip().splitlines()[0] if result.stdout.strip() else ''
-  
-  # 将时间转换为秒
-  if elapsed_time:
-    # 处理不同格式的时间
-    parts = elapsed_time.split(':')
-    if len(parts) == 3:  # HH:MM:SS
-      hours, minutes, seconds = map(int, parts)
-      total_seconds = hours * 3600 + minutes * 60 + seconds
-    elif len(parts) == 2:  # MM:SS
-      minutes, seconds = map(int, parts)
-      total_seconds = minutes * 60 + seconds
-    elif len(parts) == 1:  # SS
-      total_seconds = int(parts[0])
-    else:
-      total_seconds = 0
-    
-    return total_seconds
-  else:
-    return None  # 作业可能不存在或没有执行时间
-  
+@with_file_lock(VCM_REGR_FILENAME)
 def handle_sim_time_pass(cursor, logger:Logger, args):
-  sim_manager = SimManager(cursor)
+  sim_manager = get_manager(cursor, SimManager)
 
-  task_items : list[TaskItem]
-  sim_items: list[SimItem]
-  task_item : TaskItem
-  regr_items: list[RegrItem]
+  pending_sims: list[PendingSim]
 
   if os.path.basename(os.getcwd()) != "slurm":
     logger.log("Current directory must be 'slurm'.", level="ERROR")
     return
 
-  regr_list = RegrListItem.load_from_file()
-  regr_items = regr_list.get_regrs()
-
-  for regr_item in regr_items:
-    task_items = regr_item.get_tasks()
-    if not task_items or not isinstance(task_items, list):
-      logger.log("No task_item data found in regr_item.", level="ERROR")
-      return
-
-    for task_item in task_items:
-      sim_items = task_item.get_sims()
-      if sim_items is None:
-        logger.log("No sim_items found in a task_item.", level="ERROR")
-        continue
-    
-      status_post = getattr(task_item, "status_post", "False")
-      post_flag = False if status_post in ("False", "None") else True
-    
-      sim_item : SimItem
-      for sim_item in sim_items:
-        # sim_item 是 SimItem 实例
-        sim_info = sim_item.to_dict()
-        if sim_item.status == "TODO":
-          sim_info = process_single_sim_info(logger, args, sim_manager, sim_info, post_flag)
-          # 直接更新 sim_item 的属性
-          sim_item.status = sim_info.get("status", sim_item.status)
-          sim_item.sim_result = sim_info.get("sim_result", sim_item.sim_result)
-          sim_item.sim_log = sim_info.get("sim_log", sim_item.sim_log)
-        else:
-          logger.log(f"sim_id '{sim_item.sim_id}' has already been processed, skipping.", level="INFO")
-    # 更新 task_item 的状态
-    regr_list.update_regr(regr_item)
-
-  # 保存整个 regr_list
-  regr_list.save_to_file()
\ No newline at end of file
+  jobs = getattr(args, "jobs", 1) or 1
+
+  # 增量模式：从旁路缓存读取每个日志的扫描断点，只扫描新追加的内容
+  scan_store = None
+  if getattr(args, "incremental", False):
+    scan_store = LogScanStateStore.load_from_file(VCM_SCAN_FILENAME)
+
+  # 流式读取回归状态，只为 TODO 仿真构建 SimItem，已是最终状态的仿真不加载也不重写
+  pending_sims = RegrListItem.load_todo_sims()
+  if not pending_sims:
+    logger.log("No TODO sims found, nothing to check.", level="INFO")
+    return
+
+  for _, regr_pending in groupby(pending_sims, key=lambda p: p.key[0]):
+    regr_pending = list(regr_pending)
+
+    # 一次 sacct 查询本回归所有待检查作业的运行时间
+    prefetch_jobs_info([p.sim.job_id for p in regr_pending])
+
+    # 并行模式：先在进程池中解析所有待检查日志，再按原顺序写回结果
+    check_results = None
+    if jobs > 1:
+      sim_entries = [
+        (
+          p.sim.sim_id, p.sim.sim_log, p.post_flag,
+          scan_store.get(p.sim.sim_log) if scan_store else None
+        )
+        for p in regr_pending
+      ]
+      check_results = iter(check_sim_logs(sim_entries, jobs))
+
+    for pending in regr_pending:
+      sim_item = pending.sim
+      sim_info = sim_item.to_dict()
+      if check_results is None:
+        sim_info = process_single_sim_info(logger, args, sim_manager, sim_info, pending.post_flag, scan_store)
+      else:
+        _, fun_result, tim_result, new_state = next(check_results)
+        if scan_store:
+          scan_store.set(sim_item.sim_log, new_state)
+        sim_info = apply_sim_check_result(logger, args, sim_manager, sim_info, fun_result, tim_result)
+      # 直接更新 sim_item 的属性
+      sim_item.status = sim_info.get("status", sim_item.status)
+      sim_item.sim_result = sim_info.get("sim_result", sim_item.sim_result)
+      sim_item.sim_log = sim_info.get("sim_log", sim_item.sim_log)
+
+  # 只把检查过的仿真写回原位置
+  RegrListItem.save_todo_sims(pending_sims)
+  if scan_store:
+    scan_store.save_to_file()
@@ -1,13 +1,16 @@
 import os
 import json
-from constants import NODE_MAP
+from constants import NODE_MAP, VCM_REGR_FILENAME
+from utils.utils_file import with_file_lock
 from item.regr_item import RegrItem
 from item.sim_item import SimItem
 from item.task_item import TaskItem
 from item.regr_list_item import RegrListItem
-from utils.utils_env import get_job_status_name
+from utils.utils_env import get_job_status_name, prefetch_jobs_info
+from utils.utils_scan import resolve_log_path
 from sim.sim_manager import SimManager
 from typing import List
+from db_context import get_manager
 
 def get_regr_node_name(status_log_path="status_check.log"):
   jobid_sim_map = {}
@@ -83,7 +86,10 @@ def update_sim_info(
     sim_log_path = get_regr_sim_log_path(
       node_name, regr_item.current_user, regr_item.work_name, case_name, case_seed
     )
-    if os.path.exists(sim_log_path):
+    # 已被压缩的日志使用 .log.gz/.log.zst 路径
+    resolved_log_path = resolve_log_path(sim_log_path)
+    if resolved_log_path:
+      sim_log_path = resolved_log_path
       sim_info.sim_log = sim_log_path
       sim_info.status = "TODO"
       print(f"[VCM] sim_id '{sim_id}' (job_id '{job_id}'): Updated simulation log path to '{sim_log_path}'.")
@@ -113,13 +119,10 @@ def assign_sim_to_task(
   for task in task_items:
     task_node = task.current_host
     if task_node and task_node == node_name:
-      if not hasattr(task, "sim_logs") or task.sim_logs is None:
+      if task.sim_logs is None:
         task.sim_logs = []
-      already_in = any(
-        getattr(log, "sim_id", None) == sim_id or getattr(log, "job_id", None) == job_id
-        for log in task.sim_logs
-      )
-      if not already_in:
+      # 按 sim_id / job_id 索引查找，避免每个 sim 都扫描整个 sim_logs
+      if not task.has_sim(sim_id, job_id):
         task.add_sim(sim_info)
         sim_manager.update_sim_task_id(sim_id, task.task_id)
         print(f"[VCM] sim_id '{sim_id}' assigned to task on node '{node_name}'.")
@@ -143,19 +146,24 @@ def process_regr_item(
     print("[VCM] Error: No tasks found in regr_item.")
     return regr_item
 
+  # 一次性批量查询所有作业状态，避免每个 sim 单独调用 sacct
+  prefetch_jobs_info([sim_info.job_id for sim_info in sim_items])
+
   new_sim_items = []
   for sim_info in sim_items:
     sim_info, task_items, updated = update_sim_info(sim_info, regr_item, sim_manager, task_items)
     if not updated:
       new_sim_items.append(sim_info)
-    regr_item.set_tasks(task_items)
-    
+
+  # task 已在 assign_sim_to_task 中原地更新，循环结束后统一写回一次
+  regr_item.set_tasks(task_items)
   regr_item.set_sims(new_sim_items)
   return regr_item
 
+@with_file_lock(VCM_REGR_FILENAME)
 def handle_update_node_dir(cursor, args):
   regr_list:RegrListItem
-  sim_manager = SimManager(cursor)
+  sim_manager = get_manager(cursor, SimManager)
 
   if os.path.basename(os.getcwd()) != "slurm":
     print("[VCM] Error: Current directory must be 'slurm'.")
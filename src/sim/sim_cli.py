@@ -34,8 +34,11 @@ class SimCLI:
       },
       "update_time_pass": {
         "help": "Update simulation time and pass status.",
-        "usage": "%(prog)s ",
-        "arguments": []
+        "usage": "%(prog)s [--jobs N] [--incremental]",
+        "arguments": [
+          ("--jobs", "Number of worker processes for log checking", {"type": int, "default": 1}),
+          ("--incremental", "Resume log scanning from the offsets saved in vcm_regr_scan.json", {"action": "store_true"})
+        ]
       },
       "list": {
         "help": "Fetch simulation records.",
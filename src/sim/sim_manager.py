@@ -1,5 +1,6 @@
 
 from utils.utils_format import fetch_with_headers
+from db_manager import table_exists
 
 class SimManager:
   def __init__(self, cursor):
@@ -10,6 +11,18 @@ class SimManager:
         cursor: 数据库游标对象，用于执行 SQL 操作
     """
     self.cursor = cursor
+    self._case_stats_ready = None
+
+  def has_case_stats(self):
+    """
+    case_stats 表是否存在（迁移步骤 3 之后才有），每个连接只查询一次。
+    旧结构的数据库上跳过统计维护，不影响仿真结果的写入。
+    """
+    if self._case_stats_ready is None:
+      self._case_stats_ready = table_exists(self.cursor, 'case_stats')
+      if not self._case_stats_ready:
+        print("[VCM] Warning: case_stats table not found, run 'vcm db migrate' to enable case statistics.")
+    return self._case_stats_ready
 
   def add_sim_basic_regr(self, case_id, job_id, case_seed, created_by):
     """
@@ -31,6 +44,38 @@ class SimManager:
     )
     return self.cursor.lastrowid
 
+  def add_sims_basic_regr(self, sim_rows, created_by):
+    """
+    批量向 sim_info 表添加回归仿真记录，在一个事务内用单次 executemany 插入
+
+    参数:
+        sim_rows (list): (case_id, job_id, case_seed) 元组列表
+        created_by (str): 创建人
+
+    返回:
+        list: 与 sim_rows 顺序一致的新记录ID列表
+    """
+    if not sim_rows:
+      return []
+    if not self.cursor.connection.in_transaction:
+      # 立即获取写锁，保证下面分配的ID不会被其他进程占用
+      self.cursor.execute('BEGIN IMMEDIATE')
+    self.cursor.execute('SELECT COALESCE(MAX(sim_id), 0) FROM sim_info')
+    max_id = self.cursor.fetchone()[0]
+    self.cursor.execute("SELECT seq FROM sqlite_sequence WHERE name = 'sim_info'")
+    seq = self.cursor.fetchone()
+    start_id = max(max_id, seq[0] if seq else 0) + 1
+    sim_ids = list(range(start_id, start_id + len(sim_rows)))
+    self.cursor.executemany(
+      '''INSERT INTO sim_info (sim_id, case_id, job_id, case_seed, created_by)
+         VALUES (?, ?, ?, ?, ?)''',
+      [(sim_id, case_id, job_id, case_seed, created_by)
+       for sim_id, (case_id, job_id, case_seed) in zip(sim_ids, sim_rows)]
+    )
+    if self.cursor.rowcount != len(sim_rows):
+      raise RuntimeError(f"Expected {len(sim_rows)} sim_info rows, inserted {self.cursor.rowcount}")
+    return sim_ids
+
   def add_sim_basic_single(self, case_id, case_seed, task_id, created_by):
     """
     向 sim_info 表添加单次仿真记录（非回归）
@@ -93,18 +138,95 @@ class SimManager:
 
   def update_sim_time_pass(self, sim_id, sim_time, error_num, timing_num, is_pass):
     """
-    更新指定仿真ID的仿真时间、错误数和时序数
+    更新指定仿真ID的仿真时间、错误数和时序数，并同步更新该用例的 case_stats 统计
 
     参数:
         sim_id (int): 仿真ID
         sim_time (int): 仿真时间
         error_num (int): 错误数
         timing_num (int): 时序数
+        is_pass (bool): 是否通过
     """
+    if not self.cursor.connection.in_transaction:
+      # 先拿写锁再读旧结果，避免多个进程同时检查同一仿真时重复计数
+      self.cursor.execute('BEGIN IMMEDIATE')
+    self.cursor.execute(
+      'SELECT case_id, created_at, is_check FROM sim_info WHERE sim_id = ?',
+      (sim_id,)
+    )
+    old = self.cursor.fetchone()
     self.cursor.execute(
       '''UPDATE sim_info SET sim_time = ?, error_num = ?, timing_num = ?, is_check = ?, is_pass = ? WHERE sim_id = ?''',
       (sim_time, error_num, timing_num, True, is_pass, sim_id)
     )
+    if old is None or old[0] is None or not self.has_case_stats():
+      return
+    case_id, created_at, was_checked = old
+    if was_checked:
+      # 重复检查时旧结果可能是最大耗时或最近一次通过/失败，按该用例重新汇总
+      self.refresh_case_stats(case_id)
+      return
+
+    result = 'pass' if is_pass else 'fail'
+    sim_time = sim_time or 0
+    self.cursor.execute(
+      f'''
+      UPDATE case_stats SET
+        run_count = run_count + 1,
+        pass_count = pass_count + ?,
+        total_sim_time = total_sim_time + ?,
+        max_sim_time = MAX(max_sim_time, ?),
+        last_{result}_at = CASE WHEN COALESCE(last_{result}_sim_id, 0) < ? THEN ? ELSE last_{result}_at END,
+        last_{result}_sim_id = MAX(COALESCE(last_{result}_sim_id, 0), ?)
+      WHERE case_id = ?
+      ''',
+      (1 if is_pass else 0, sim_time, sim_time, sim_id, created_at, sim_id, case_id)
+    )
+    if self.cursor.rowcount == 0:
+      self.cursor.execute(
+        f'''
+        INSERT INTO case_stats (case_id, run_count, pass_count, total_sim_time, max_sim_time,
+                                last_{result}_sim_id, last_{result}_at)
+        VALUES (?, 1, ?, ?, ?, ?, ?)
+        ''',
+        (case_id, 1 if is_pass else 0, sim_time, sim_time, sim_id, created_at)
+      )
+
+  def refresh_case_stats(self, case_id=None):
+    """
+    由 sim_info 重新汇总 case_stats，用于迁移回填或修正统计
+
+    参数:
+        case_id (int): 只重算该用例，为 None 时重算全部用例
+    """
+    where = 'AND case_id = ?' if case_id is not None else ''
+    params = (case_id,) if case_id is not None else ()
+    self.cursor.execute(f'DELETE FROM case_stats WHERE 1=1 {where}', params)
+    self.cursor.execute(
+      f'''
+      INSERT INTO case_stats (case_id, run_count, pass_count, total_sim_time, max_sim_time,
+                              last_pass_sim_id, last_fail_sim_id)
+      SELECT case_id, COUNT(*),
+             SUM(CASE WHEN is_pass THEN 1 ELSE 0 END),
+             SUM(COALESCE(sim_time, 0)),
+             MAX(COALESCE(sim_time, 0)),
+             MAX(CASE WHEN is_pass THEN sim_id END),
+             MAX(CASE WHEN is_pass THEN NULL ELSE sim_id END)
+      FROM sim_info
+      WHERE is_check AND case_id IS NOT NULL {where}
+      GROUP BY case_id
+      ''',
+      params
+    )
+    self.cursor.execute(
+      f'''
+      UPDATE case_stats SET
+        last_pass_at = (SELECT created_at FROM sim_info WHERE sim_id = case_stats.last_pass_sim_id),
+        last_fail_at = (SELECT created_at FROM sim_info WHERE sim_id = case_stats.last_fail_sim_id)
+      WHERE 1=1 {where}
+      ''',
+      params
+    )
 
   def update_sim_task_id(self, sim_id, task_id):
     """
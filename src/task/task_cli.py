@@ -1,13 +1,14 @@
 from task.task_service import TaskService
 from task.task_report import print_tasks_table
 from task.task_manager import TaskManager
+from db_context import get_manager
 
 class TaskCLI:
   def __init__(self, cursor, logger):
     self.cursor = cursor
     self.logger = logger
     self.service = TaskService(cursor, logger)
-    self.manager = TaskManager(cursor)
+    self.manager = get_manager(cursor, TaskManager)
 
   def add_task_subcommands(subparsers):
     commands = {
@@ -81,6 +81,24 @@ class TaskManager(BaseManager):
       self.cursor.execute('SELECT * FROM tasks ORDER BY task_id DESC')
     return self.cursor.fetchall()
   
+  def list_tasks_with_module_name(self, limit: Optional[int] = None) -> List[Any]:
+    """
+    获取任务列表，按 task_id 降序排列，第二列为模块名称而非模块ID。
+    ...
+    """
+    sql = '''
+      SELECT t.task_id, m.module_name, t.created_at, t.created_by, t.git_de, t.git_dv,
+             t.is_regr, t.regr_id, t.node_name, t.is_post, t.corner_name
+      FROM tasks t
+      LEFT JOIN modules m ON t.module_id = m.module_id
+      ORDER BY t.task_id DESC
+    '''
+    if limit is not None:
+      self.cursor.execute(sql + ' LIMIT ?', (limit,))
+    else:
+      self.cursor.execute(sql)
+    return self.cursor.fetchall()
+
   def get_regr_node_info(self, regr_id: int) -> Optional[Dict[str, Any]]:
     """
     获取回归节点信息。
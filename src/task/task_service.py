@@ -1,23 +1,25 @@
 import os
 import json
 import datetime
-from constants import get_current_user, get_current_dir, get_current_time, get_current_host, NODE_MAP
+from constants import get_current_user, get_current_dir, get_current_time, get_current_host, NODE_MAP, VCM_REGR_FILENAME
 from utils.utils_git import get_module_name, get_git_info
 from utils.utils_env import get_comp_corner, determine_regr_type, check_comp_result, get_node_info
 from task.task_manager import TaskManager
 from module.module_manager import ModuleManager
 from utils.utils_lib import rm_vcm_fail_file, add_vcm_fail_file
+from utils.utils_file import atomic_write_json, with_file_lock
 from item.regr_item import RegrItem
 from item.task_item import TaskItem
 from item.regr_list_item import RegrListItem
 from utils.utils_log import Logger
+from db_context import get_manager
 
 class TaskService:
   def __init__(self, cursor, logger: Logger):
     self.cursor = cursor
     self.logger = logger
-    self.manager = TaskManager(cursor)
-    self.module_manager = ModuleManager(cursor)
+    self.manager = get_manager(cursor, TaskManager)
+    self.module_manager = get_manager(cursor, ModuleManager)
 
   def _prepare_task_item(self, args, comp_file, json_file, write_db=False):
     status_log = rm_vcm_fail_file("vcm.comp.fail")
@@ -149,6 +151,7 @@ class TaskService:
         task_item = TaskItem.load_from_file(vcm_task_info_path)
         handler(user_name, work_name, node_dir, vcm_task_info_path, task_item, regr_item)
 
+  @with_file_lock(VCM_REGR_FILENAME)
   def update_task_regr_id(self) -> None:
     """
     更新任务的回归 ID。
@@ -248,7 +251,7 @@ class TaskService:
     return success
 
   def list_tasks(self, count=None):
-    return self.manager.list_tasks(limit=count)
+    return self.manager.list_tasks_with_module_name(limit=count)
   
   def append_sim_log_to_task_info(self, task_info , sim_log_entry , file_vcm_task: str) -> None:
     """
@@ -258,7 +261,6 @@ class TaskService:
     if "sim_logs" not in task_info or not isinstance(task_info["sim_logs"], list):
       task_info["sim_logs"] = []
     task_info["sim_logs"].append(sim_log_entry)
-    with open(file_vcm_task, "w") as f:
-      json.dump(task_info, f, indent=2)
+    atomic_write_json(file_vcm_task, task_info, indent=2)
 
   
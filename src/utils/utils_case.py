@@ -1,6 +1,7 @@
 import os
 import re
 from typing import List
+from utils.utils_scan import resolve_log_path, open_log
 
 def find_case_uvm_dir():
   """
@@ -60,21 +61,22 @@ def find_case_sw_info(case_name):
 def find_case_hw_info(file_path: str = "sim.log"):
   """
   功能描述:
-    从仿真日志文件首行提取用例名称和随机种子。
+    从仿真日志文件首行提取用例名称和随机种子，支持 .gz/.zst 压缩日志。
 
   参数:
-    file_path (str): 日志文件路径，默认 "sim.log"。
+    file_path (str): 日志文件路径，默认 "sim.log"，不存在时查找压缩版本。
 
   返回值:
     tuple: (case_name, case_seed)，均为 str 或 None。
   """
-  if not os.path.isfile(file_path):
+  log_path = resolve_log_path(file_path)
+  if not log_path:
     print(f"[VCM] Error, {file_path} not found.")
     return None, None
 
   # 打开文件并只读取第一行
-  with open(file_path, "r") as file:
-    first_line = file.readline().strip() # 读取第一行并去掉两端多余的空白字符
+  with open_log(log_path) as file:
+    first_line = file.readline().decode('utf-8', errors='ignore').strip() # 读取第一行并去掉两端多余的空白字符
 
   # 使用正则表达式提取参数内容
   seed_match = re.search(r'\+ntb_random_seed=(\d+)', first_line)
@@ -4,6 +4,8 @@ import random
 from glob import glob
 from constants import NODE_MAP, get_current_user,get_current_dir, VCM_TASK_FILENAME
 from constants import check_vtool_home
+from utils.utils_scan import scan_sim_log_incremental, read_tail_lines, resolve_log_path, open_log, LOG_COMPRESS_SUFFIXES, load_log_exceptions, get_exceptions_hash
+from utils.utils_log_cache import get_log_result_cache
 import subprocess
 
 def determine_regr_type(logger):
@@ -44,8 +46,8 @@ def check_comp_result(logger, log_file_path):
     logger.log(f"Log file '{log_file_path}' does not exist.", level="ERROR")
     return False
   try:
-    with open(log_file_path, 'r') as file:
-      lines = file.readlines()
+    # 只从文件末尾反向读取最后两行
+    lines = read_tail_lines(log_file_path, 2)
   except Exception as e:
     logger.log(f"Failed to read '{log_file_path}': {e}", level="ERROR")
     return False
@@ -56,7 +58,7 @@ def check_comp_result(logger, log_file_path):
     return False
 
   # 获取最后两行
-  last_two_lines = [line.strip() for line in lines[-2:]]
+  last_two_lines = [line.strip() for line in lines]
 
   # 检查最后是否符合模式
   if re.search(elaboration_pattern, last_two_lines[1]) :
@@ -109,48 +111,111 @@ def get_comp_corner(logger, comp_log_path="comp.log"):
   return None
 
 
-def check_sim_single_function_result(log_file='sim.log', exception_file='log_exception'):
+def get_log_exception_file(exception_file='log_exception'):
   """
-  检查仿真日志中的功能错误数量，忽略指定异常。
+  获取系统例外文件路径（$VTOOL_HOME/tool/log/<exception_file>）。
 
   参数:
-    log_file: 仿真日志文件名，默认为'sim.log'。
-    exception_file: 异常内容文件名，默认为'log_exception'。
+    exception_file: 例外文件名，默认为'log_exception'。
 
   返回:
-    int: 检测到的错误数量。
+    str: 例外文件路径。
   """
   vtool_home = check_vtool_home()
-    
-  # 定义异常文件路径
-  exception_file_path = os.path.join(vtool_home, 'tool', 'log', exception_file)
+  return os.path.join(vtool_home, 'tool', 'log', exception_file)
 
-  # 获取异常内容
-  exceptions = set()
+def get_timing_result(error_count, time_max_num=0):
+  """
+  按最大容忍数换算 Timing violation 数量。
 
-  # 读取系统异常文件
-  if os.path.isfile(exception_file_path):
-    with open(exception_file_path, 'r') as ef:
-      exceptions.update(line.strip() for line in ef)
+  参数:
+    error_count: Timing violation 数量。
+    time_max_num: Timing violation最大容忍数，默认为0。
 
-  if os.path.exists(log_file) is False:
+  返回:
+    int: 超出容忍数的Timing violation数量。
+  """
+  if time_max_num == 0:
+    return error_count
+  if error_count > time_max_num:
+    return error_count
+  return error_count - time_max_num
+
+def scan_sim_log_cached(log_file, exceptions, scan_state=None):
+  """
+  先查询日志结果缓存，未命中时扫描日志并写入缓存。
+
+  参数:
+    log_file: 仿真日志路径。
+    exceptions: 例外字符串集合。
+    scan_state: 上次扫描的断点状态（可选）。
+
+  返回:
+    tuple: (result, scan_state)，命中缓存时 scan_state 原样返回。
+  """
+  # .log 不存在时使用已压缩的 .log.gz/.log.zst
+  log_file = resolve_log_path(log_file) or log_file
+  cache = get_log_result_cache()
+  if cache is not None:
+    cached = cache.get(log_file, get_exceptions_hash(exceptions))
+    if cached is not None:
+      return cached, scan_state
+  result, new_state = scan_sim_log_incremental(log_file, exceptions, scan_state)
+  if cache is not None:
+    cache.put(result)
+  return result, new_state
+
+def check_sim_single_scan(log_file='sim.log', timing_check=False, exception_file='log_exception', time_max_num=0, scan_state=None):
+  """
+  单遍扫描仿真日志，同时得到功能错误数量和Timing violation数量，支持断点续扫。
+
+  参数:
+    log_file: 仿真日志文件名，默认为'sim.log'。
+    timing_check: 是否检查Timing violation。
+    exception_file: 异常内容文件名，默认为'log_exception'。
+    time_max_num: Timing violation最大容忍数，默认为0。
+    scan_state: 上次扫描的断点状态（可选），提供时只扫描新追加的内容。
+
+  返回:
+    tuple: (error_num, timing_num, scan_state)，不检查时序时 timing_num 为 0。
+  """
+  exceptions = load_log_exceptions([get_log_exception_file(exception_file)])
+  result, new_state = scan_sim_log_cached(log_file, exceptions, scan_state)
+  if not result.exist:
     print(f"[VCM] Error: Log file '{log_file}' not found.")
-    return 0
+    return 0, 0, None
+  timing_num = get_timing_result(result.timing_num, time_max_num) if timing_check else 0
+  return result.error_num, timing_num, new_state
 
-  # 读取日志文件并检查错误
-  count_error = 0
-    
-  with open(log_file, 'r') as log:
-    for line in log:
-      # 检查是否包含异常内容
-      if any(exception in line for exception in exceptions):
-        continue
-            
-      # 检查是否是错误信息
-      if re.search(r'UVM_ERROR|\[ERROR\]|\[error\]|UVM_FATAL', line):
-        count_error += 1
-
-  return count_error
+def check_sim_single_result(log_file='sim.log', timing_check=False, exception_file='log_exception', time_max_num=0):
+  """
+  单遍扫描仿真日志，同时得到功能错误数量和Timing violation数量。
+
+  参数:
+    log_file: 仿真日志文件名，默认为'sim.log'。
+    timing_check: 是否检查Timing violation。
+    exception_file: 异常内容文件名，默认为'log_exception'。
+    time_max_num: Timing violation最大容忍数，默认为0。
+
+  返回:
+    tuple: (error_num, timing_num)，不检查时序时 timing_num 为 0。
+  """
+  error_num, timing_num, _ = check_sim_single_scan(log_file, timing_check, exception_file, time_max_num)
+  return error_num, timing_num
+
+def check_sim_single_function_result(log_file='sim.log', exception_file='log_exception'):
+  """
+  检查仿真日志中的功能错误数量，忽略指定异常。
+
+  参数:
+    log_file: 仿真日志文件名，默认为'sim.log'。
+    exception_file: 异常内容文件名，默认为'log_exception'。
+
+  返回:
+    int: 检测到的错误数量。
+  """
+  error_num, _ = check_sim_single_result(log_file, False, exception_file)
+  return error_num
 
 def check_sim_single_timing_result(file_path='sim.log', time_max_num=0):
   """
@@ -163,25 +228,11 @@ def check_sim_single_timing_result(file_path='sim.log', time_max_num=0):
   返回:
     int: 超出容忍数的Timing violation数量。
   """
-  # 初始化计数器
-  error_count = 0
-
-  # 读取文件并检查时间违规
-  with open(file_path, 'r') as log_file:
-    for line in log_file:
-      if "Timing violation" in line:
-        error_count += 1
-
-  # 输出结果
-  if time_max_num == 0:
-    error_out = error_count
-  else:
-    if error_count > time_max_num:
-      error_out = error_count
-    else:
-      error_out = error_count - time_max_num
-
-  return error_out
+  result, _ = scan_sim_log_cached(file_path, set())
+  if not result.exist:
+    print(f"[VCM] Error: Log file '{file_path}' not found.")
+    return 0
+  return get_timing_result(result.timing_num, time_max_num)
 
 def get_node_info(part_name, part_mode, node_name):
   """
@@ -253,7 +304,7 @@ def check_regr_comp_result(logger, part_name, part_mode, node_name, work_name):
 
 def check_regr_log_extract(base_path, timing_check=False, exception_files=None,  time_max_num=0):
   """
-  查找并分析所有 case*test/case*/case*test_*.log 文件，输出名称、seed、error数量、fatal数量、log路径、finished、timing_violation_num。
+  查找并分析所有 case*test/case*/case*test_*.log 文件（包括 .log.gz/.log.zst），输出名称、seed、error数量、fatal数量、log路径、finished、timing_violation_num。
 
   参数:
     base_path: 搜索的根目录。
@@ -265,47 +316,32 @@ def check_regr_log_extract(base_path, timing_check=False, exception_files=None,
     list: 结果列表，每项为 dict，包含名称、seed、error数量、log路径、finished、timing_violation_num。
   """
 
-  exceptions = set()
-  if exception_files:
-    for ef in exception_files:
-      if os.path.isfile(ef):
-        with open(ef, 'r') as f:
-          for line in f:
-            exceptions.add(line.strip())
+  exceptions = load_log_exceptions(exception_files)
 
-  pattern = os.path.join(base_path, "case*test", "case*", "case*test_*.log")
-  log_files = glob(pattern, recursive=True)
+  log_files = {}
+  for suffix in ("",) + LOG_COMPRESS_SUFFIXES:
+    pattern = os.path.join(base_path, "case*test", "case*", "case*test_*.log" + suffix)
+    for log_path in glob(pattern, recursive=True):
+      # 同时存在压缩和未压缩版本时只统计未压缩的
+      log_files.setdefault(log_path[:len(log_path) - len(suffix)], log_path)
 
   results = []
-  for log_path in log_files:
-    m = re.search(r'(case[^/]*test)/case[^/]*?/case[^/]*test_(\w+)\.log$', log_path)
+  for log_path in log_files.values():
+    m = re.search(r'(case[^/]*test)/case[^/]*?/case[^/]*test_(\w+)\.log(?:\.gz|\.zst)?$', log_path)
     if not m:
       continue
     case_name = m.group(1)
     seed = m.group(2)
 
-    error_count = 0
-    finished = False
-    lines_buffer = []
-    timing_violation_num = 0
-
     try:
-      with open(log_path, 'r', errors='ignore') as f:
-        for line in f:
-          lines_buffer.append(line)
-          if len(lines_buffer) > 50:
-            lines_buffer.pop(0)
-          if any(exc in line for exc in exceptions):
-            continue
-          if re.search(r'UVM_FATAL|UVM_ERROR|\[ERROR\]|\[error\]', line):
-            error_count += 1
-          if timing_check and "Timing violation" in line:
-            timing_violation_num += 1
+      scan_result, _ = scan_sim_log_cached(log_path, exceptions)
     except Exception as e:
       continue
-    finished = any("finish at simulation time" in l for l in lines_buffer)
+    if not scan_result.exist:
+      continue
 
     # 如果设置了最大容忍数，返回超出部分，否则返回总数
+    timing_violation_num = scan_result.timing_num - scan_result.timing_except_num
     if timing_check:
       if time_max_num > 0:
         timing_violation_num = max(0, timing_violation_num - time_max_num)
@@ -313,9 +349,9 @@ def check_regr_log_extract(base_path, timing_check=False, exception_files=None,
     results.append({
       'case_name': case_name,
       'case_seed': seed,
-      'error_count': error_count,
+      'error_count': scan_result.error_num,
       'log_path': log_path,
-      'finished': finished,
+      'finished': scan_result.finished,
       'timing_count': timing_violation_num if timing_check else None
     })
 
@@ -332,35 +368,176 @@ def get_sim_log_time(log_path):
     list: 提取的时间信息列表。
   """
   time_info = []
-  if not os.path.isfile(log_path):
+  log_path = resolve_log_path(log_path)
+  if not log_path:
     return time_info
-  with open(log_path, 'r') as f:
+  with open_log(log_path) as f:
     for line in f:
-      if "Simulation time" in line:
-        time_info.append(line.strip())
+      if b"Simulation time" in line:
+        time_info.append(line.decode('utf-8', errors='ignore').strip())
   return time_info
 
-def get_job_status_name(job_id):
-  # 查询 job 状态
+SACCT_CHUNK_SIZE = 500
+
+def parse_sacct_output(output):
+  """
+  解析 sacct --parsable2 输出（JobID|State|NodeList|Elapsed）。
+
+  参数:
+    output: sacct 命令的标准输出。
+
+  返回:
+    dict: {job_id: {"state": str, "node": str, "elapsed": str}}，忽略 job step 行。
+  """
+  jobs_info = {}
+  for line in output.splitlines():
+    parts = line.strip().split('|')
+    if len(parts) < 4:
+      continue
+    job_id, state, node, elapsed = parts[:4]
+    # 跳过 123.batch / 123.extern 等 step 行
+    if not job_id or '.' in job_id:
+      continue
+    jobs_info[job_id] = {
+      "state": state.split()[0] if state else "",
+      "node": node.strip(),
+      "elapsed": elapsed.strip(),
+    }
+  return jobs_info
+
+def query_jobs_info(job_ids, chunk_size=SACCT_CHUNK_SIZE):
+  """
+  批量查询作业状态，每 chunk_size 个作业只调用一次 sacct。
+
+  参数:
+    job_ids: 作业ID列表。
+    chunk_size: 单次 sacct 查询的最大作业数，避免命令行参数过长。
+
+  返回:
+    dict: {job_id: {"state": str, "node": str, "elapsed": str}}，查询不到的作业不在其中。
+  """
+  ids = list(dict.fromkeys(str(job_id) for job_id in job_ids if job_id))
+  jobs_info = {}
+  for i in range(0, len(ids), chunk_size):
+    chunk = ids[i:i + chunk_size]
+    try:
+      output = subprocess.check_output(
+        ['sacct', '-j', ','.join(chunk), '--format=JobID,State,NodeList,Elapsed', '--parsable2', '--noheader'],
+        stderr=subprocess.DEVNULL
+      ).decode()
+    except (subprocess.CalledProcessError, OSError) as e:
+      print(f"[VCM] Error: sacct query failed: {e}")
+      continue
+    jobs_info.update(parse_sacct_output(output))
+  return jobs_info
+
+# 本次命令调用内的作业记账缓存，job_id -> 作业信息（None 表示 sacct 中不存在）
+_JOB_ACCT_CACHE = {}
+
+def prefetch_jobs_info(job_ids):
+  """
+  批量查询尚未缓存的作业，并写入本次调用的作业记账缓存。
+
+  参数:
+    job_ids: 作业ID列表。
+
+  返回:
+    dict: 作业记账缓存。
+  """
+  missing = list(dict.fromkeys(
+    str(job_id) for job_id in job_ids if job_id and str(job_id) not in _JOB_ACCT_CACHE
+  ))
+  if missing:
+    jobs_info = query_jobs_info(missing)
+    for job_id in missing:
+      _JOB_ACCT_CACHE[job_id] = jobs_info.get(job_id)
+  return _JOB_ACCT_CACHE
+
+def get_job_info(job_id):
+  """
+  从作业记账缓存获取作业信息，未缓存时单独查询一次。
+
+  参数:
+    job_id: 作业ID。
+
+  返回:
+    dict 或 None: {"state", "node", "elapsed"}，作业不存在时为 None。
+  """
+  return prefetch_jobs_info([job_id]).get(str(job_id))
+
+def parse_elapsed_time(elapsed):
+  """
+  将 sacct Elapsed 字段转换为秒数。
+
+  参数:
+    elapsed: 时间字符串，支持 D-HH:MM:SS、HH:MM:SS、MM:SS、SS 以及带小数的秒。
+
+  返回:
+    int 或 None: 秒数，无法解析时为 None。
+  """
+  if not elapsed:
+    return None
+  days = 0
+  if '-' in elapsed:
+    day_str, elapsed = elapsed.split('-', 1)
+    try:
+      days = int(day_str)
+    except ValueError:
+      return None
+  parts = elapsed.split(':')
+  if len(parts) > 3:
+    return None
   try:
-    job_check = subprocess.check_output(
-      ['sacct', '-n', '-j', job_id, '-o', 'state', '--noheader'],
-      stderr=subprocess.STDOUT
-    ).decode().strip().split('\n')[-1]
+    seconds = float(parts[-1])
+    minutes = int(parts[-2]) if len(parts) >= 2 else 0
+    hours = int(parts[-3]) if len(parts) == 3 else 0
+  except ValueError:
+    return None
+  return int(((days * 24 + hours) * 60 + minutes) * 60 + seconds)
 
-    job_check = job_check.replace(" ", "")
-  except subprocess.CalledProcessError:
-    print(f"[VCM] Job {job_id} does not exist")
-    return 
+def get_job_elapsed_time(job_id):
+  """
+  从作业记账缓存获取作业运行时间。
+
+  参数:
+    job_id: 作业ID。
+
+  返回:
+    int 或 None: 运行秒数，作业不存在或没有执行时间时为 None。
+  """
+  job_info = get_job_info(job_id)
+  if not job_info:
+    return None
+  return parse_elapsed_time(job_info["elapsed"])
+
+def get_job_status_from_info(job_info):
+  """
+  根据 sacct 查询结果判断作业状态。
+
+  参数:
+    job_info: query_jobs_info 返回的单个作业信息，None 表示作业不存在。
 
+  返回:
+    tuple: (job_status, job_node, job_check)，作业不存在时均为 None。
+  """
+  if not job_info:
+    return None, None, None
+  job_check = job_info["state"]
   if job_check == "COMPLETED":
-    job_node = subprocess.check_output(
-      ['sacct', '-j', job_id, '--format=NodeList'],
-      stderr=subprocess.STDOUT
-    ).decode().strip().split('\n')[-1].replace(" ", "")
-    job_status = "OK"
-  else:
-    job_node = ""
-    job_status = "TODO"
+    return "OK", job_info["node"], job_check
+  return "TODO", "", job_check
 
-  return job_status, job_node, job_check
\ No newline at end of file
+def get_job_status_name(job_id):
+  """
+  查询单个作业状态，优先读取作业记账缓存（见 prefetch_jobs_info）。
+
+  参数:
+    job_id: 作业ID。
+
+  返回:
+    tuple: (job_status, job_node, job_check)，作业不存在时均为 None。
+  """
+  job_info = get_job_info(job_id)
+  if job_info is None:
+    print(f"[VCM] Job {job_id} does not exist")
+  return get_job_status_from_info(job_info)
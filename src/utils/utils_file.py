@@ -0,0 +1,121 @@
+"""
+状态文件的原子写入与进程间加锁
+"""
+import os
+import json
+import fcntl
+import tempfile
+import functools
+from contextlib import contextmanager
+
+# 本进程已持有的锁: 锁文件绝对路径 -> [fd, 嵌套层数]
+_HELD_LOCKS = {}
+
+@contextmanager
+def file_lock(path):
+  """
+  对 path 加进程间排他锁（fcntl.flock，锁文件为 path + ".lock"），同一进程内可重入。
+
+  多个 slurm 作业在同一目录下同时执行 vcm 时，用它把“读取-修改-写回”整个过程串行化。
+
+  参数:
+    path: 被保护的文件路径。
+  """
+  lock_path = os.path.abspath(path) + ".lock"
+  held = _HELD_LOCKS.get(lock_path)
+  if held is not None:
+    held[1] += 1
+    try:
+      yield
+    finally:
+      held[1] -= 1
+    return
+
+  fd = os.open(lock_path, os.O_RDWR | os.O_CREAT, 0o666)
+  try:
+    fcntl.flock(fd, fcntl.LOCK_EX)
+    _HELD_LOCKS[lock_path] = [fd, 1]
+    try:
+      yield
+    finally:
+      del _HELD_LOCKS[lock_path]
+      fcntl.flock(fd, fcntl.LOCK_UN)
+  finally:
+    os.close(fd)
+
+def with_file_lock(path):
+  """
+  装饰器：在 file_lock(path) 内执行被装饰的函数，path 为相对路径时按调用时的当前目录解析。
+  """
+  def decorator(func):
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+      with file_lock(path):
+        return func(*args, **kwargs)
+    return wrapper
+  return decorator
+
+def _target_mode(path):
+  try:
+    return os.stat(path).st_mode & 0o7777
+  except FileNotFoundError:
+    umask = os.umask(0)
+    os.umask(umask)
+    return 0o666 & ~umask
+
+@contextmanager
+def atomic_open(path, mode="w", encoding=None):
+  """
+  原子写文件：先写同目录下的临时文件，fsync 后用 os.replace 替换目标文件。
+
+  写入过程中进程被杀或磁盘配额不足时，目标文件保持原内容，不会出现截断的文件。
+  临时文件沿用目标文件原有权限（新文件按 umask）。只保证单次写入的原子性，
+  多个进程“读取-修改-写回”同一文件时，调用方还需用 file_lock 串行化。
+
+  参数:
+    path: 目标文件路径。
+    mode: "w" 或 "wb"。
+    encoding: 文本模式的编码。
+  """
+  path = os.path.abspath(path)
+  dir_name, base_name = os.path.split(path)
+  fd, tmp_path = tempfile.mkstemp(prefix=f".{base_name}.", suffix=".tmp", dir=dir_name)
+  try:
+    os.fchmod(fd, _target_mode(path))
+    with os.fdopen(fd, mode, encoding=encoding) as f:
+      yield f
+      f.flush()
+      os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+  except BaseException:
+    try:
+      os.unlink(tmp_path)
+    except OSError:
+      pass
+    raise
+  _fsync_dir(dir_name)
+
+def _fsync_dir(dir_name):
+  # 目录项落盘后 rename 才算持久化；部分文件系统不支持对目录 fsync，忽略即可
+  try:
+    fd = os.open(dir_name, os.O_RDONLY)
+  except OSError:
+    return
+  try:
+    os.fsync(fd)
+  except OSError:
+    pass
+  finally:
+    os.close(fd)
+
+def atomic_write_json(path, data, **dump_kwargs):
+  """
+  以原子方式把 data 写为 JSON 文件。
+
+  参数:
+    path: 目标文件路径。
+    data: 可 JSON 序列化的对象。
+    dump_kwargs: 透传给 json.dump 的参数（indent、ensure_ascii 等）。
+  """
+  with atomic_open(path, "w", encoding="utf-8") as f:
+    json.dump(data, f, **dump_kwargs)
@@ -1,9 +1,8 @@
 import matplotlib.pyplot as plt
 from collections import defaultdict
-from item.regr_list_item import RegrListItem
-from item.regr_item import RegrItem
-from item.task_item import TaskItem
+from item.regr_status import RegrStatusSummary
 import os
+from constants import get_real_time
 
 def fetch_with_headers(cursor, sql, params=()):
   """
@@ -184,6 +183,41 @@ def generate_html_report_with_chart(sims, headers, filename='simulation_report.h
   with open(filename, 'w') as f:
     f.write(html_content)
 
+def format_display_value(value, kind=None):
+  """
+  将数据库字段转换为表格显示字符串。
+
+  参数:
+    value: 字段值。
+    kind: None 普通文本；"time" 数据库时间，显示时+8小时；"flag" 布尔标志，显示为 ✔/X。
+
+  返回:
+    str: 显示字符串。
+  """
+  if kind == "flag":
+    return "✔" if value in (1, True) else "X"
+  if value is None:
+    return ""
+  if kind == "time":
+    try:
+      return get_real_time(value)
+    except Exception:
+      return str(value)
+  return str(value)
+
+def format_display_rows(rows, kinds):
+  """
+  按列类型批量格式化查询结果，供各 *_report.py 打印表格使用。
+
+  参数:
+    rows: 查询结果行列表。
+    kinds: 每列的显示类型（见 format_display_value）。
+
+  返回:
+    list: 字符串行列表。
+  """
+  return [[format_display_value(value, kind) for value, kind in zip(row, kinds)] for row in rows]
+
 def print_table(headers, rows):
   """
   通用表格打印函数。
@@ -213,69 +247,39 @@ def print_table(headers, rows):
     print(" | ".join(str(row[i]).ljust(col_widths[i]) for i in range(len(headers))))
   print(line)
 
-def print_regr_case_status(regr_list_item: RegrListItem):
+def print_regr_case_status(regr_summaries):
   """
   按regr分组统计并打印每个回归下case（task）的状态分布。
   包括：等待数、已完成检查数、检查通过/失败数，并以表格形式展示详细case状态。
+
+  参数:
+    regr_summaries: RegrListItem.summarize() 返回的 RegrStatusSummary 列表。
   """
-  regr: RegrItem
-  t : TaskItem
-
-  for regr in regr_list_item.get_regrs():
-    # 统计waiting
-    waiting = sum(1 for sim in getattr(regr, "sims", []) if getattr(sim, "status", "") == "TODO")
-    tasks = regr.get_tasks()
-    total = len(tasks)
-    sim_ok = 0
-    sim_todo = 0
-    check_done = 0
-    check_pass = 0
-    check_fail = 0
-
-    for t in tasks:
-      for sim in t.get_sim_logs():
-        status = getattr(sim, "status", "")
-        sim_result = getattr(sim, "sim_result", "")
-        if status == "OK":
-          sim_ok += 1
-        elif status == "TODO":
-          sim_todo += 1
-        elif status in ("CheckDone", "CheckFail"):
-          check_done += 1
-          if sim_result == "Pass":
-            check_pass += 1
-          elif sim_result == "Fail":
-            check_fail += 1
+  regr: RegrStatusSummary
+
+  for regr in regr_summaries:
+    tasks = regr.tasks
+    status_post = tasks[0].status_post if tasks else "None"
 
     print(f"[VCM] regr_id: {regr.regr_id} - {regr.module_name} - {regr.case_list}")
-    print(f"  Post: {regr.get_tasks()[0].status_post}, SDF: {regr.work_name}")
-    print(f"  Total task : {total}")
-    print(f"  Sim Pending: {waiting}")
-    print(f"  Sim Finish : {sim_ok}")
-    print(f"  Sim Checked: {check_done} (Pass: {check_pass}, Fail: {check_fail})")
+    print(f"  Post: {status_post}, SDF: {regr.work_name}")
+    print(f"  Total task : {len(tasks)}")
+    print(f"  Sim Pending: {regr.waiting}")
+    print(f"  Sim Finish : {regr.sim_ok}")
+    print(f"  Sim Checked: {regr.check_done} (Pass: {regr.check_pass}, Fail: {regr.check_fail})")
 
     # 表格打印详细case状态
     headers = ["TaskID", "Finished", "TODO", "Checck Pass", "Check Fail", "Sim Total"]
-    rows = []
-    for t in tasks:
-      logs = t.get_sim_logs()
-      ok = sum(1 for sim in logs if getattr(sim, "status", "") == "OK")
-      todo = sum(1 for sim in logs if getattr(sim, "status", "") == "TODO")
-      pass_cnt = sum(1 for sim in logs if getattr(sim, "status", "") in ("CheckDone", "CheckFail") and getattr(sim, "sim_result", "") == "Pass")
-      fail_cnt = sum(1 for sim in logs if getattr(sim, "status", "") in ("CheckDone", "CheckFail") and getattr(sim, "sim_result", "") == "Fail")
-      rows.append([t.task_id, ok, todo, pass_cnt, fail_cnt, len(logs)])
+    rows = [[t.task_id, t.ok, t.todo, t.check_pass, t.check_fail, t.total] for t in tasks]
 
     print_table(headers, rows)
 
     fail_case_names = []
 
     # show fail case name, and log_path
-    for t in tasks:
-      logs = t.get_sim_logs()
-      for sim in logs:
-        if getattr(sim, "sim_result", "") == "Fail":
-          print(f"  [Fail] sim{sim.sim_id}: {sim.case_name} - {sim.case_seed} - {sim.sim_log}")
-          fail_case_names.append(str(sim.case_name))
+    for sim_id, case_name, case_seed, sim_log in regr.fail_sims:
+      print(f"  [Fail] sim{sim_id}: {case_name} - {case_seed} - {sim_log}")
+      fail_case_names.append(str(case_name))
 
     # fail_case_names 去重
     fail_case_names = list(sorted(set(fail_case_names)))
@@ -0,0 +1,152 @@
+"""
+JSON 文件的流式读取：按块读入并逐个产出解析事件，内存占用与文件大小无关
+"""
+import json
+import re
+
+JSON_STREAM_CHUNK_SIZE = 64 * 1024
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_SCALAR_END = re.compile(r"[ \t\n\r,:\]}]")
+_DECODER = json.JSONDecoder()
+
+class JsonStreamReader:
+  """
+  事件式 JSON 读取器。
+
+  iter_events 依次产出 (path, event, value)：
+    path: 从根到当前位置的键元组，数组元素记为 "item"，例如 ("regrs", "item", "tasks")。
+    event: "start_map" / "end_map" / "start_array" / "end_array" / "value"。
+    value: "value" 事件的值，其余事件为 None。
+
+  路径在 decode_paths 中的值整体解码为一个 "value" 事件（例如单个 sim 对象），
+  不再产出其内部事件。缓冲区只保留尚未解析的内容，内存占用约为一个读取块加上最大的单个整体解码值。
+  """
+  def __init__(self, f, decode_paths=(), chunk_size=JSON_STREAM_CHUNK_SIZE):
+    """
+    参数:
+      f: 以文本模式打开的文件对象。
+      decode_paths: 需要整体解码的路径元组集合。
+      chunk_size: 每次读取的字符数。
+    """
+    self.f = f
+    self.decode_paths = set(decode_paths)
+    self.chunk_size = chunk_size
+    self.buf = ""
+    self.pos = 0
+    self.eof = False
+
+  def _read(self):
+    chunk = self.f.read(self.chunk_size)
+    if not chunk:
+      self.eof = True
+      return False
+    # 丢弃已解析的部分
+    self.buf = self.buf[self.pos:] + chunk
+    self.pos = 0
+    return True
+
+  def _peek(self):
+    """跳过空白并返回下一个字符（不消耗），文件结束时返回空串"""
+    while True:
+      self.pos = _WHITESPACE.match(self.buf, self.pos).end()
+      if self.pos < len(self.buf):
+        return self.buf[self.pos]
+      if not self._read():
+        return ""
+
+  def _decode(self):
+    if self.buf[self.pos] not in ('"', "{", "["):
+      # 数字和 true/false/null 在块边界处截断时仍能解码出一部分，先读到其后的分隔符
+      while not _SCALAR_END.search(self.buf, self.pos) and self._read():
+        pass
+    while True:
+      try:
+        value, end = _DECODER.raw_decode(self.buf, self.pos)
+      except json.JSONDecodeError:
+        # 字符串或整体解码的对象被块边界截断时读入更多内容后重试
+        if self._read():
+          continue
+        raise
+      self.pos = end
+      return value
+
+  def _expect(self, char):
+    if self._peek() != char:
+      raise ValueError(f"Expected '{char}' at offset {self.pos} of JSON stream")
+    self.pos += 1
+
+  def iter_events(self):
+    path = []
+    containers = []   # 当前所在的容器，"map" 或 "array"
+    while True:
+      char = self._peek()
+      if containers:
+        if char == ",":
+          self.pos += 1
+          char = self._peek()
+        if char in ("}", "]"):
+          self.pos += 1
+          containers.pop()
+          path.pop()
+          yield tuple(path), "end_map" if char == "}" else "end_array", None
+          if not containers:
+            return
+          continue
+        if containers[-1] == "map":
+          path[-1] = self._decode()
+          self._expect(":")
+          char = self._peek()
+        else:
+          path[-1] = "item"
+      if not char:
+        raise ValueError("Unexpected end of JSON stream")
+
+      current = tuple(path)
+      if char in ("{", "[") and current not in self.decode_paths:
+        self.pos += 1
+        containers.append("map" if char == "{" else "array")
+        path.append(None)
+        yield current, "start_map" if char == "{" else "start_array", None
+      else:
+        yield current, "value", self._decode()
+        if not containers:
+          return
+
+class JsonStreamWriter:
+  """
+  按 JsonStreamReader 的事件逐个写出 JSON，格式与 json.dump(indent=indent) 一致，
+  可与读取器配合流式改写文件中的少量值。
+  """
+  def __init__(self, f, indent=2, ensure_ascii=False):
+    self.f = f
+    self.indent = " " * indent
+    self.ensure_ascii = ensure_ascii
+    self.containers = []   # [类型, 已写入的成员数]
+
+  def _begin_member(self, path):
+    if not self.containers:
+      return
+    container = self.containers[-1]
+    self.f.write(",\n" if container[1] else "\n")
+    self.f.write(self.indent * len(self.containers))
+    container[1] += 1
+    if container[0] == "map":
+      self.f.write(json.dumps(path[-1], ensure_ascii=self.ensure_ascii) + ": ")
+
+  def write_event(self, path, event, value=None):
+    if event == "value":
+      self._begin_member(path)
+      text = json.dumps(value, indent=len(self.indent), ensure_ascii=self.ensure_ascii)
+      if self.containers and "\n" in text:
+        text = text.replace("\n", "\n" + self.indent * len(self.containers))
+      self.f.write(text)
+    elif event in ("start_map", "start_array"):
+      self._begin_member(path)
+      self.f.write("{" if event == "start_map" else "[")
+      self.containers.append(["map" if event == "start_map" else "array", 0])
+    else:
+      _, count = self.containers.pop()
+      if count:
+        self.f.write("\n" + self.indent * len(self.containers))
+      self.f.write("}" if event == "end_map" else "]")
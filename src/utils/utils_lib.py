@@ -1,6 +1,8 @@
 import os
 from constants import get_current_dir
 from db_manager import init_database
+from db_migrate import migrate_database
+from utils.utils_file import atomic_write_json
 import json
 import matplotlib.pyplot as plt
 from collections import defaultdict
@@ -25,6 +27,7 @@ def get_db_name(debug=False):
 
 def create_db_file(cursor, db_name):
   init_database(cursor)
+  migrate_database(cursor.connection)
   try:
     os.chmod(db_name, 0o1777)
     db_dir = os.path.dirname(db_name)
@@ -49,8 +52,7 @@ def save_regr_info_to_json(regr_info: dict, json_path: str = "vcm_regr_info.json
     raise ValueError("regr_info must be a dictionary.")
   json_file_path = os.path.join(get_current_dir(), json_path)
   try:
-    with open(json_file_path, "w", encoding="utf-8") as f:
-      json.dump(regr_info, f, ensure_ascii=False, indent=2)
+    atomic_write_json(json_file_path, regr_info, ensure_ascii=False, indent=2)
   except Exception as e:
     print(f"[VCM] Error saving regression info: {e}")
 
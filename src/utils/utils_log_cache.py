@@ -0,0 +1,178 @@
+"""
+仿真日志检查结果缓存
+"""
+import os
+import json
+import time
+import atexit
+import sqlite3
+from constants import check_vtool_home, LOG_CACHE_EN
+from utils.utils_scan import LogScanResult
+
+LOG_CACHE_FILENAME = "vcm_log_cache.db"
+LOG_CACHE_MAX_ENTRIES = 200000
+LOG_CACHE_EVICT_INTERVAL = 1000
+LOG_CACHE_ACCESS_BATCH = 500
+
+class LogResultCache:
+  """
+  日志检查结果的持久化缓存，保存在 $VTOOL_HOME/data/vcm_log_cache.db。
+
+  以 (log_path, exception_hash) 为键，只有文件 size 和 mtime_ns 都未变化时才命中；
+  例外文件内容变化后哈希不同，旧结果自动失效，并按最近访问时间(LRU)淘汰。
+  命中时只在内存中记录访问时间，攒够一批或写入新结果时再一次性更新，读多写少时不必每次都拿写锁。
+  数据库出错（被锁、只读等）时按未命中处理，调用方照常扫描日志。
+  """
+  def __init__(self, db_path, max_entries=LOG_CACHE_MAX_ENTRIES):
+    """
+    参数:
+      db_path: 缓存数据库路径。
+      max_entries: 最大缓存条数，超出后淘汰最久未访问的记录。
+    """
+    self.db_path = db_path
+    self.max_entries = max_entries
+    self.put_count = 0
+    self.pending_access = {}
+    self.warned = False
+    created = not os.path.exists(db_path)
+    self.conn = sqlite3.connect(db_path, timeout=30, isolation_level=None)
+    self.conn.execute('PRAGMA synchronous=NORMAL')
+    self.conn.execute('''
+      CREATE TABLE IF NOT EXISTS log_result (
+        log_path TEXT NOT NULL,
+        exception_hash TEXT NOT NULL,
+        size INTEGER NOT NULL,
+        mtime_ns INTEGER NOT NULL,
+        result TEXT NOT NULL,
+        last_access REAL NOT NULL,
+        PRIMARY KEY (log_path, exception_hash)
+      )
+    ''')
+    self.conn.execute('CREATE INDEX IF NOT EXISTS idx_log_result_access ON log_result(last_access)')
+    if created:
+      # 与 vcm.db 一样放开权限，共享安装下其他用户也能写入缓存
+      try:
+        os.chmod(db_path, 0o1777)
+      except OSError as e:
+        print(f"[VCM] Warning: Failed to set permissions on '{db_path}': {e}")
+
+  def _warn(self, e):
+    if not self.warned:
+      print(f"[VCM] Warning: Log result cache unavailable, rescanning logs: {e}")
+      self.warned = True
+
+  def get(self, log_path, exception_hash):
+    """
+    查询日志的缓存结果。
+
+    参数:
+      log_path: 日志路径。
+      exception_hash: 当前例外列表哈希。
+
+    返回:
+      LogScanResult 或 None: 文件未变化时返回缓存结果，否则为 None。
+    """
+    try:
+      stat = os.stat(log_path)
+    except OSError:
+      return None
+    try:
+      row = self.conn.execute(
+        'SELECT size, mtime_ns, result FROM log_result WHERE log_path = ? AND exception_hash = ?',
+        (log_path, exception_hash)
+      ).fetchone()
+    except sqlite3.Error as e:
+      self._warn(e)
+      return None
+    if not row or row[0] != stat.st_size or row[1] != stat.st_mtime_ns:
+      return None
+    self.pending_access[(log_path, exception_hash)] = time.time()
+    if len(self.pending_access) >= LOG_CACHE_ACCESS_BATCH:
+      self.flush_access()
+    return LogScanResult.from_dict(json.loads(row[2]))
+
+  def flush_access(self):
+    """
+    在一个事务内写回攒下的访问时间，失败时丢弃（只影响淘汰顺序）。
+    """
+    if not self.pending_access:
+      return
+    pending, self.pending_access = self.pending_access, {}
+    try:
+      self.conn.execute('BEGIN')
+      self.conn.executemany(
+        'UPDATE log_result SET last_access = ? WHERE log_path = ? AND exception_hash = ?',
+        [(access, log_path, exception_hash) for (log_path, exception_hash), access in pending.items()]
+      )
+      self.conn.execute('COMMIT')
+    except sqlite3.Error as e:
+      if self.conn.in_transaction:
+        self.conn.rollback()
+      self._warn(e)
+
+  def put(self, result: LogScanResult):
+    """
+    写入日志检查结果，文件指纹取自 result.size / result.mtime_ns。
+
+    参数:
+      result: 完整扫描的 LogScanResult。
+    """
+    if not result.exist or result.exception_hash is None:
+      return
+    try:
+      self.conn.execute(
+        '''
+        INSERT OR REPLACE INTO log_result (log_path, exception_hash, size, mtime_ns, result, last_access)
+        VALUES (?, ?, ?, ?, ?, ?)
+        ''',
+        (result.log_path, result.exception_hash, result.size, result.mtime_ns,
+         json.dumps(result.to_dict()), time.time())
+      )
+      self.put_count += 1
+      if self.put_count % LOG_CACHE_EVICT_INTERVAL == 1:
+        self.flush_access()
+        self.evict()
+    except sqlite3.Error as e:
+      self._warn(e)
+
+  def evict(self):
+    """
+    淘汰最久未访问的记录，使缓存条数不超过 max_entries。
+    """
+    count = self.conn.execute('SELECT COUNT(*) FROM log_result').fetchone()[0]
+    if count <= self.max_entries:
+      return
+    self.conn.execute(
+      '''
+      DELETE FROM log_result WHERE rowid IN (
+        SELECT rowid FROM log_result ORDER BY last_access LIMIT ?
+      )
+      ''',
+      (count - self.max_entries,)
+    )
+
+  def close(self):
+    self.flush_access()
+    self.conn.close()
+
+_LOG_RESULT_CACHE = None
+
+def get_log_result_cache():
+  """
+  获取本进程共享的日志结果缓存，缓存不可用时返回 None。
+
+  返回:
+    LogResultCache 或 None
+  """
+  global _LOG_RESULT_CACHE
+  if not LOG_CACHE_EN:
+    return None
+  if _LOG_RESULT_CACHE is None:
+    try:
+      db_path = os.path.join(check_vtool_home(), "data", LOG_CACHE_FILENAME)
+      _LOG_RESULT_CACHE = LogResultCache(db_path)
+      atexit.register(_LOG_RESULT_CACHE.flush_access)
+    except (EnvironmentError, sqlite3.Error) as e:
+      print(f"[VCM] Warning: Log result cache disabled: {e}")
+      _LOG_RESULT_CACHE = False
+  return _LOG_RESULT_CACHE or None
@@ -0,0 +1,483 @@
+"""
+仿真日志扫描引擎
+"""
+import os
+import re
+import gzip
+import json
+import mmap
+import hashlib
+from contextlib import contextmanager
+from constants import LOG_SCAN_BACKEND
+from utils.utils_file import atomic_write_json
+
+try:
+  import zstandard
+except ImportError:
+  zstandard = None
+
+SCAN_CHUNK_SIZE = 8 * 1024 * 1024
+FINISH_TAIL_LINES = 50
+
+ERROR_PATTERN = re.compile(rb'UVM_ERROR|\[ERROR\]|\[error\]|UVM_FATAL')
+FATAL_PATTERN = b'UVM_FATAL'
+TIMING_PATTERN = b'Timing violation'
+FINISH_PATTERN = 'finish at simulation time'
+TAIL_BLOCK_SIZE = 8192
+# 支持的压缩日志后缀，.zst 需要安装 zstandard
+LOG_COMPRESS_SUFFIXES = ('.gz', '.zst') if zstandard is not None else ('.gz',)
+# 预过滤：只有命中该模式的行才需要进一步判断例外和分类
+SCAN_PATTERN = re.compile(rb'UVM_ERROR|\[ERROR\]|\[error\]|UVM_FATAL|Timing violation')
+
+class LogScanResult:
+  """
+  单个仿真日志的扫描结果，同时作为增量扫描的断点状态。
+
+  属性:
+    log_path: 日志路径。
+    exist: 日志文件是否存在。
+    error_num: 错误行数（UVM_ERROR/UVM_FATAL/[ERROR]/[error]，已排除例外）。
+    fatal_num: UVM_FATAL 行数（已排除例外）。
+    timing_num: Timing violation 行数（不排除例外）。
+    timing_except_num: 被例外忽略的 Timing violation 行数。
+    finished: 最后 FINISH_TAIL_LINES 行内是否出现 "finish at simulation time"。
+    line_num: 日志总行数。
+    offset: 已扫描完整行的字节偏移。
+    inode/size/mtime_ns: 扫描时的文件指纹。
+    exception_hash: 扫描时使用的例外列表哈希。
+  """
+  def __init__(
+    self, log_path, exist=True, error_num=0, fatal_num=0,
+    timing_num=0, timing_except_num=0, finished=False, line_num=0,
+    offset=0, inode=None, size=0, mtime_ns=0, exception_hash=None
+  ):
+    self.log_path = log_path
+    self.exist = exist
+    self.error_num = error_num
+    self.fatal_num = fatal_num
+    self.timing_num = timing_num
+    self.timing_except_num = timing_except_num
+    self.finished = finished
+    self.line_num = line_num
+    self.offset = offset
+    self.inode = inode
+    self.size = size
+    self.mtime_ns = mtime_ns
+    self.exception_hash = exception_hash
+
+  def to_dict(self):
+    return {
+      "log_path": self.log_path,
+      "exist": self.exist,
+      "error_num": self.error_num,
+      "fatal_num": self.fatal_num,
+      "timing_num": self.timing_num,
+      "timing_except_num": self.timing_except_num,
+      "finished": self.finished,
+      "line_num": self.line_num,
+      "offset": self.offset,
+      "inode": self.inode,
+      "size": self.size,
+      "mtime_ns": self.mtime_ns,
+      "exception_hash": self.exception_hash,
+    }
+
+  @classmethod
+  def from_dict(cls, data):
+    return cls(
+      data.get("log_path"),
+      exist=data.get("exist", True),
+      error_num=data.get("error_num", 0),
+      fatal_num=data.get("fatal_num", 0),
+      timing_num=data.get("timing_num", 0),
+      timing_except_num=data.get("timing_except_num", 0),
+      finished=data.get("finished", False),
+      line_num=data.get("line_num", 0),
+      offset=data.get("offset", 0),
+      inode=data.get("inode"),
+      size=data.get("size", 0),
+      mtime_ns=data.get("mtime_ns", 0),
+      exception_hash=data.get("exception_hash"),
+    )
+
+  def copy(self):
+    return LogScanResult.from_dict(self.to_dict())
+
+def is_compressed_log(log_path):
+  """
+  判断日志是否为压缩文件（.gz/.zst）。
+  """
+  return log_path.endswith(('.gz', '.zst'))
+
+def resolve_log_path(log_path):
+  """
+  查找日志的实际路径：原文件不存在时依次查找 .gz/.zst 压缩版本。
+
+  参数:
+    log_path: 日志路径（通常为 .log）。
+
+  返回:
+    str 或 None: 存在的日志路径，都不存在时为 None。
+  """
+  if not log_path:
+    return None
+  if os.path.isfile(log_path):
+    return log_path
+  for suffix in LOG_COMPRESS_SUFFIXES:
+    if os.path.isfile(log_path + suffix):
+      return log_path + suffix
+  return None
+
+@contextmanager
+def open_log(log_path):
+  """
+  以二进制流方式打开日志，压缩日志透明解压。
+
+  参数:
+    log_path: 日志路径。
+
+  返回:
+    二进制文件对象，支持 read(size)。
+  """
+  if log_path.endswith('.gz'):
+    with gzip.open(log_path, 'rb') as f:
+      yield f
+  elif log_path.endswith('.zst'):
+    if zstandard is None:
+      raise OSError(f"zstandard module is required to read '{log_path}'")
+    with open(log_path, 'rb') as raw, zstandard.ZstdDecompressor().stream_reader(raw) as f:
+      yield f
+  else:
+    with open(log_path, 'rb') as f:
+      yield f
+
+def _split_tail_lines(data, line_count):
+  # data 末尾的 line_count 行，行为与 readlines()[-line_count:] 一致
+  if line_count <= 0:
+    return []
+  lines = data.split(b'\n')
+  if lines and lines[-1] == b'':
+    lines.pop()
+  return [line.decode('utf-8', errors='ignore') for line in lines[-line_count:]]
+
+def _trim_tail(data, line_count):
+  # 只保留足以得到最后 line_count 行的尾部数据
+  pos = len(data)
+  for _ in range(line_count + 1):
+    pos = data.rfind(b'\n', 0, pos)
+    if pos < 0:
+      return data
+  return data[pos:]
+
+def read_tail_lines(file_path, line_count, block_size=TAIL_BLOCK_SIZE):
+  """
+  从文件末尾向前按块读取，返回最后 line_count 行，内存和 I/O 与文件大小无关。
+
+  参数:
+    file_path: 文件路径。
+    line_count: 需要的行数。
+    block_size: 每次向前读取的字节数。
+
+  返回:
+    list: 最后 line_count 行（str，不含换行符），与 readlines()[-line_count:] 对应。
+  """
+  with open(file_path, 'rb') as f:
+    f.seek(0, os.SEEK_END)
+    pos = f.tell()
+    data = b''
+    # 多读一个换行，保证第一行是完整的
+    while pos > 0 and data.count(b'\n') <= line_count:
+      read_size = min(block_size, pos)
+      pos -= read_size
+      f.seek(pos)
+      data = f.read(read_size) + data
+  return _split_tail_lines(data, line_count)
+
+def check_log_finished(log_path, tail_lines=FINISH_TAIL_LINES):
+  """
+  检查日志最后 tail_lines 行内是否出现 "finish at simulation time"。
+
+  参数:
+    log_path: 日志路径。
+    tail_lines: 检查的末尾行数。
+
+  返回:
+    bool: 是否仿真结束。
+  """
+  return any(FINISH_PATTERN in line for line in read_tail_lines(log_path, tail_lines))
+
+def load_log_exceptions(exception_files):
+  """
+  读取例外文件，每行一个例外字符串。
+
+  参数:
+    exception_files: 例外文件路径列表，不存在的文件会被忽略。
+
+  返回:
+    set: 例外字符串集合。
+  """
+  exceptions = set()
+  for exception_file in exception_files or []:
+    if os.path.isfile(exception_file):
+      with open(exception_file, 'r') as f:
+        exceptions.update(line.strip() for line in f)
+  return exceptions
+
+def get_exceptions_hash(exceptions):
+  """
+  计算例外列表的哈希，例外内容变化时扫描结果需要作废。
+
+  参数:
+    exceptions: 例外字符串集合。
+
+  返回:
+    str: sha1 十六进制字符串。
+  """
+  content = "\n".join(sorted(exc for exc in exceptions or () if exc))
+  return hashlib.sha1(content.encode('utf-8')).hexdigest()
+
+def compile_exception_matcher(exceptions):
+  """
+  将例外字符串集合编译为单个交替正则，替代逐条 `exc in line` 判断。
+
+  参数:
+    exceptions: 例外字符串集合，空字符串会被忽略。
+
+  返回:
+    re.Pattern 或 None: bytes 正则，没有有效例外时为 None。
+  """
+  patterns = sorted({exc.encode('utf-8') for exc in exceptions or () if exc}, key=len, reverse=True)
+  if not patterns:
+    return None
+  return re.compile(b'|'.join(re.escape(p) for p in patterns))
+
+def can_resume_scan(state, stat, exception_hash):
+  """
+  判断断点状态是否可用于续扫：同一文件（inode）、未被截断、例外列表未变化。
+
+  参数:
+    state: 上次扫描保存的 LogScanResult。
+    stat: 当前文件的 os.stat_result。
+    exception_hash: 当前例外列表哈希。
+
+  返回:
+    bool: 是否可以从 state.offset 继续扫描。
+  """
+  if state is None or not state.exist:
+    return False
+  if state.inode != stat.st_ino or state.exception_hash != exception_hash:
+    return False
+  if stat.st_size < state.size or stat.st_size < state.offset:
+    return False
+  if stat.st_size == state.size and stat.st_mtime_ns != state.mtime_ns:
+    # 大小相同但内容被重写
+    return False
+  return True
+
+def _check_resume_boundary(f, offset):
+  # 续扫起点前一个字节必须是换行，否则文件已被替换
+  if offset == 0:
+    return True
+  f.seek(offset - 1)
+  return f.read(1) == b'\n'
+
+def _make_buffer_scanner(result, exception_matcher):
+  # 返回 scan_buffer(buf, start, end)，将命中行的统计累加到 result
+
+  def scan_line(line):
+    is_timing = TIMING_PATTERN in line
+    if is_timing:
+      result.timing_num += 1
+    if exception_matcher is not None and exception_matcher.search(line):
+      if is_timing:
+        result.timing_except_num += 1
+      return
+    if ERROR_PATTERN.search(line):
+      result.error_num += 1
+      if FATAL_PATTERN in line:
+        result.fatal_num += 1
+
+  def scan_buffer(buf, start=0, end=None):
+    # buf[start:end] 只包含完整的行，逐个处理命中预过滤模式的行；buf 可以是 bytes 或 mmap
+    end = len(buf) if end is None else end
+    line_start = -1
+    for match in SCAN_PATTERN.finditer(buf, start, end):
+      pos = match.start()
+      if pos < line_start:
+        continue
+      line_start = buf.rfind(b'\n', start, pos) + 1 or start
+      line_end = buf.find(b'\n', pos, end)
+      if line_end < 0:
+        line_end = end
+      scan_line(buf[line_start:line_end])
+      line_start = line_end + 1
+
+  return scan_buffer
+
+def _scan_compressed_log(log_path, exceptions, chunk_size=SCAN_CHUNK_SIZE):
+  # 流式解压并单遍扫描压缩日志，同时保留解压流末尾用于判断仿真结束
+  result = LogScanResult(log_path)
+  exception_matcher = compile_exception_matcher(exceptions)
+  stat = os.stat(log_path)
+  scan_buffer = _make_buffer_scanner(result, exception_matcher)
+
+  carry = b''
+  tail = b''
+  with open_log(log_path) as f:
+    while True:
+      chunk = f.read(chunk_size)
+      if not chunk:
+        break
+      tail = _trim_tail(tail + chunk, FINISH_TAIL_LINES)
+      buf = carry + chunk
+      split = buf.rfind(b'\n') + 1
+      carry = buf[split:]
+      buf = buf[:split]
+      scan_buffer(buf)
+      result.line_num += buf.count(b'\n')
+      result.offset += len(buf)
+  if carry:
+    scan_buffer(carry)
+    result.line_num += 1
+
+  result.inode = stat.st_ino
+  result.size = stat.st_size
+  result.mtime_ns = stat.st_mtime_ns
+  result.exception_hash = get_exceptions_hash(exceptions)
+  result.finished = any(FINISH_PATTERN in line for line in _split_tail_lines(tail, FINISH_TAIL_LINES))
+  return result
+
+def scan_sim_log_incremental(
+  log_path, exceptions=None, state=None, chunk_size=SCAN_CHUNK_SIZE, backend=LOG_SCAN_BACKEND
+):
+  """
+  单遍扫描仿真日志；提供断点状态时只扫描上次偏移之后新追加的内容。
+  仿真结束标志只从文件末尾反向读取判断，不随文件大小增长。
+  .gz/.zst 压缩日志以流式解压单遍扫描，结束标志取自解压流的末尾，不支持断点续扫。
+
+  参数:
+    log_path: 日志文件路径。
+    exceptions: 例外字符串集合，包含任一例外的行不计入错误。
+    state: 上次扫描返回的断点状态（LogScanResult），文件被截断或替换时自动从头扫描。
+    chunk_size: 每次读取的字节数。
+    backend: "stream" 分块读取，"mmap" 映射整个文件后直接在映射区上做正则搜索，
+      映射失败时自动退回 "stream"。
+
+  返回:
+    tuple: (result, state)
+      result (LogScanResult): 整个文件的扫描结果。
+      state (LogScanResult): 截止最后一个完整行的断点状态，文件不存在或为压缩日志时为 None。
+  """
+  log_path = resolve_log_path(log_path) or log_path
+  result = LogScanResult(log_path)
+  if not os.path.isfile(log_path):
+    result.exist = False
+    return result, None
+  if is_compressed_log(log_path):
+    return _scan_compressed_log(log_path, exceptions, chunk_size), None
+
+  exception_matcher = compile_exception_matcher(exceptions)
+  exception_hash = get_exceptions_hash(exceptions)
+  stat = os.stat(log_path)
+
+  carry = b''
+  with open(log_path, 'rb') as f:
+    if can_resume_scan(state, stat, exception_hash) and _check_resume_boundary(f, state.offset):
+      result = state.copy()
+      result.log_path = log_path
+    scan_buffer = _make_buffer_scanner(result, exception_matcher)
+
+    mapped = None
+    if backend == "mmap" and stat.st_size > result.offset:
+      try:
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+      except (ValueError, OSError):
+        # 无法映射（特殊文件、部分网络文件系统等）时退回分块读取
+        mapped = None
+
+    if mapped is not None:
+      with mapped:
+        size = len(mapped)
+        split = mapped.rfind(b'\n', result.offset) + 1 or result.offset
+        scan_buffer(mapped, result.offset, split)
+        # mmap 没有 count()，按块统计行数
+        for pos in range(result.offset, split, chunk_size):
+          result.line_num += mapped[pos:min(pos + chunk_size, split)].count(b'\n')
+        result.offset = split
+        carry = mapped[split:size]
+    else:
+      f.seek(result.offset)
+      while True:
+        chunk = f.read(chunk_size)
+        if not chunk:
+          break
+        buf = carry + chunk
+        split = buf.rfind(b'\n') + 1
+        carry = buf[split:]
+        buf = buf[:split]
+        scan_buffer(buf)
+        result.line_num += buf.count(b'\n')
+        result.offset += len(buf)
+
+  result.inode = stat.st_ino
+  result.size = stat.st_size
+  result.mtime_ns = stat.st_mtime_ns
+  result.exception_hash = exception_hash
+  new_state = result.copy()
+
+  # 末尾不完整的行只计入本次结果，不写入断点状态
+  if carry:
+    scan_buffer(carry)
+    result.line_num += 1
+  result.finished = check_log_finished(log_path)
+  new_state.finished = result.finished
+  return result, new_state
+
+def scan_sim_log(log_path, exceptions=None, chunk_size=SCAN_CHUNK_SIZE, backend=LOG_SCAN_BACKEND):
+  """
+  以大块二进制读取方式单遍扫描仿真日志，同时统计错误、FATAL、时序违例和仿真结束标志。
+
+  参数:
+    log_path: 日志文件路径。
+    exceptions: 例外字符串集合，包含任一例外的行不计入错误。
+    chunk_size: 每次读取的字节数。
+    backend: 扫描后端，见 scan_sim_log_incremental。
+
+  返回:
+    LogScanResult: 扫描结果，文件不存在时 exist 为 False。
+  """
+  result, _ = scan_sim_log_incremental(log_path, exceptions, None, chunk_size, backend)
+  return result
+
+class LogScanStateStore:
+  """
+  增量扫描断点状态的旁路缓存文件，按日志路径保存 LogScanResult。
+  """
+  def __init__(self, path, states=None):
+    self.path = path
+    self.states = states if states is not None else {}
+
+  @classmethod
+  def load_from_file(cls, path):
+    if not os.path.exists(path) or os.path.getsize(path) == 0:
+      return cls(path)
+    try:
+      with open(path, "r") as f:
+        data = json.load(f)
+    except (OSError, ValueError) as e:
+      print(f"[VCM] Warning: Failed to read scan state '{path}': {e}, rescanning all logs.")
+      return cls(path)
+    states = {k: LogScanResult.from_dict(v) for k, v in data.get("logs", {}).items()}
+    return cls(path, states)
+
+  def save_to_file(self):
+    atomic_write_json(self.path, {"logs": {k: v.to_dict() for k, v in self.states.items()}}, indent=2)
+
+  def get(self, log_path):
+    return self.states.get(log_path)
+
+  def set(self, log_path, state):
+    if state is None:
+      self.states.pop(log_path, None)
+    else:
+      self.states[log_path] = state
@@ -1,5 +1,7 @@
 import sys
 from db_manager import db_connection
+from db_context import get_db_context
+from db_migrate import migrate_database, print_migration_status
 from utils.utils_lib import get_db_name, create_db_file
 from utils.utils_log import Logger
 from utils.utils_git import get_project_and_module_name_from_git
@@ -34,8 +36,13 @@ def parse_args(args, cursor, logger, db_name, debug=False):
     cli_project.service.add_project(project_name)
     cli_module.service.add_module(project_name, module_name)
   elif args.command == 'db':
-    if hasattr(args, 'subcommand') and args.subcommand == 'init':
+    subcommand = getattr(args, 'subcommand', None)
+    if subcommand == 'init':
       create_db_file(cursor, db_name)
+    elif subcommand == 'migrate':
+      migrate_database(cursor.connection)
+    elif subcommand == 'status':
+      print_migration_status(cursor)
   elif args.command in command_map:
     command_map[args.command]()
   else:
@@ -57,5 +64,6 @@ if __name__ == "__main__":
     sys.exit(0)
 
   with db_connection(db_name) as conn:
-    cursor = conn.cursor()
+    # 所有命令共用同一个游标和 Manager 实例
+    cursor = get_db_context(conn).cursor
     parse_args(args, cursor, logger, db_name, debug=getattr(args, "debug", False))
\ No newline at end of file
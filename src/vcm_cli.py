@@ -39,6 +39,8 @@ class VcmCLI:
     db_parser = subparsers.add_parser('db', help="Database management")
     db_subparsers = db_parser.add_subparsers(dest='subcommand')
     db_subparsers.add_parser('init', help="Initialize the database")
+    db_subparsers.add_parser('migrate', help="Apply pending schema migrations")
+    db_subparsers.add_parser('status', help="Show schema version and pending migrations")
 
     project_parser = subparsers.add_parser('project', help="Project management")
     project_subparsers = project_parser.add_subparsers(dest='subcommand')
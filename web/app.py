@@ -1,8 +1,17 @@
 from flask import Flask, redirect, url_for
-from routes import main_routes
+from routes import main_routes, api_routes
+from utils.db import init_db_pool
 
-app = Flask(__name__)
-app.register_blueprint(main_routes)
+def create_app(config=None):
+    app = Flask(__name__)
+    if config:
+        app.config.update(config)
+    init_db_pool(app)
+    app.register_blueprint(main_routes)
+    app.register_blueprint(api_routes)
+    return app
+
+app = create_app()
 
 
 if __name__ == '__main__':
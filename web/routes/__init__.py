@@ -1 +1,2 @@
-from .main import main_routes
\ No newline at end of file
+from .main import main_routes
+from .api import api_routes
\ No newline at end of file
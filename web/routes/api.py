@@ -0,0 +1,167 @@
+from flask import Blueprint, jsonify, request
+
+from utils.db import get_db
+
+api_routes = Blueprint('api_routes', __name__, url_prefix='/api')
+
+PAGE_LIMIT_DEFAULT = 100
+PAGE_LIMIT_MAX = 1000
+
+# 按模块名过滤：先在 modules 上按名称找到 module_id，再走各表的 module_id 索引
+MODULE_FILTER = "{alias}.module_id IN (SELECT module_id FROM modules WHERE module_name = ?)"
+
+# 各列表的查询定义：
+#   id: 翻页键，按该列倒序分页（AUTOINCREMENT 主键，越大越新）
+#   columns: 返回列，顺序与模板表头一致
+#   filters: 请求参数 -> WHERE 条件，参数值按位置绑定
+#   requires: 可选，依赖的迁移表，数据库尚未迁移时返回 503 而不是查询出错
+PAGED_TABLES = {
+    'cases': {
+        'table': 'case_info c',
+        'id': 'c.case_id',
+        'columns': ['c.case_id', 'c.module_id', 'c.case_name', 'c.case_c_name',
+                    'c.case_c_group', 'c.created_at', 'c.created_by'],
+        'filters': {
+            'module': MODULE_FILTER.format(alias='c'),
+            'case': "c.case_name = ?",
+            'user': "c.created_by = ?",
+            'date_from': "c.created_at >= ?",
+            'date_to': "c.created_at < DATE(?, '+1 day')",
+        },
+    },
+    'regrs': {
+        'table': 'regr_info r',
+        'id': 'r.regr_id',
+        'columns': ['r.regr_id', 'r.module_id', 'r.regr_base', 'r.regr_type', 'r.part_name',
+                    'r.part_mode', 'r.node_name', 'r.work_name', 'r.work_url', 'r.case_list',
+                    'r.created_at', 'r.created_by'],
+        'filters': {
+            'module': MODULE_FILTER.format(alias='r'),
+            'user': "r.created_by = ?",
+            'date_from': "r.created_at >= ?",
+            'date_to': "r.created_at < DATE(?, '+1 day')",
+        },
+    },
+    'tasks': {
+        'table': 'tasks t',
+        'id': 't.task_id',
+        'columns': ['t.task_id', 't.module_id', 't.git_de', 't.git_dv', 't.is_regr', 't.regr_id',
+                    't.node_name', 't.is_post', 't.corner_name', 't.created_at', 't.created_by'],
+        'filters': {
+            'module': MODULE_FILTER.format(alias='t'),
+            'user': "t.created_by = ?",
+            'date_from': "t.created_at >= ?",
+            'date_to': "t.created_at < DATE(?, '+1 day')",
+        },
+    },
+    'sims': {
+        'table': 'sim_info s',
+        'id': 's.sim_id',
+        'columns': ['s.sim_id', 's.case_id', 's.task_id', 's.case_seed', 's.job_id', 's.is_check',
+                    's.sim_time', 's.error_num', 's.timing_num', 's.is_pass', 's.created_at',
+                    's.created_by'],
+        'filters': {
+            'module': "s.case_id IN (SELECT c.case_id FROM case_info c JOIN modules m ON c.module_id = m.module_id WHERE m.module_name = ?)",
+            'case': "s.case_id IN (SELECT case_id FROM case_info WHERE case_name = ?)",
+            'user': "s.created_by = ?",
+            'date_from': "s.created_at >= ?",
+            'date_to': "s.created_at < DATE(?, '+1 day')",
+            'pass': "s.is_pass = ?",
+        },
+    },
+    # 用例统计读取 case_stats 汇总表，不聚合 sim_info；该表由 vcm db migrate 步骤 3 创建
+    'case_stats': {
+        'table': 'case_info c JOIN case_stats cs ON cs.case_id = c.case_id',
+        'requires': 'case_stats',
+        'id': 'c.case_id',
+        'columns': ['c.case_id', 'c.module_id', 'c.case_name', 'cs.run_count', 'cs.pass_count',
+                    'ROUND(100.0 * cs.pass_count / cs.run_count, 1) AS pass_rate',
+                    'cs.total_sim_time / cs.run_count AS avg_sim_time', 'cs.max_sim_time',
+                    'cs.last_pass_sim_id', 'cs.last_pass_at', 'cs.last_fail_sim_id', 'cs.last_fail_at'],
+        'filters': {
+            'module': MODULE_FILTER.format(alias='c'),
+            'case': "c.case_name = ?",
+        },
+    },
+}
+
+def parse_int_arg(name, default=None, minimum=None, maximum=None):
+    value = request.args.get(name, '')
+    if value == '':
+        return default
+    try:
+        value = int(value)
+    except ValueError:
+        raise ValueError(f"{name} must be an integer")
+    if minimum is not None and value < minimum:
+        raise ValueError(f"{name} must be >= {minimum}")
+    if maximum is not None:
+        value = min(value, maximum)
+    return value
+
+def build_page_query(spec, args, after_id, limit):
+    """
+    拼接一页数据的查询语句。
+
+    参数:
+        spec: PAGED_TABLES 中的表定义。
+        args: 请求参数，只使用 spec['filters'] 中列出的参数，空值忽略。
+        after_id: 上一页最后一行的ID，为 None 时从最新一行开始。
+        limit: 每页行数。
+
+    返回:
+        tuple: (sql, params)
+    """
+    conditions = []
+    params = []
+    for name, condition in spec['filters'].items():
+        value = args.get(name, '')
+        if value == '':
+            continue
+        if name == 'pass':
+            value = 1 if value.lower() in ('1', 'true', 'pass') else 0
+        conditions.append(condition)
+        params.append(value)
+    if after_id is not None:
+        conditions.append(f"{spec['id']} < ?")
+        params.append(after_id)
+
+    sql = f"SELECT {', '.join(spec['columns'])} FROM {spec['table']}"
+    if conditions:
+        sql += " WHERE " + " AND ".join(conditions)
+    sql += f" ORDER BY {spec['id']} DESC LIMIT ?"
+    params.append(limit)
+    return sql, params
+
+@api_routes.route('/<table_name>')
+def list_page(table_name):
+    """
+    键集分页接口：GET /api/<cases|regrs|tasks|sims|case_stats>?after_id=&limit=&module=&...
+
+    按ID倒序返回一页数据，next_after_id 为下一页请求的 after_id，没有更多数据时为 null。
+    """
+    spec = PAGED_TABLES.get(table_name)
+    if spec is None:
+        return jsonify({'error': f"Unknown table '{table_name}'"}), 404
+    try:
+        after_id = parse_int_arg('after_id')
+        limit = parse_int_arg('limit', PAGE_LIMIT_DEFAULT, minimum=1, maximum=PAGE_LIMIT_MAX)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    cursor = get_db().cursor()
+    if 'requires' in spec:
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (spec['requires'],))
+        if cursor.fetchone() is None:
+            return jsonify({'error': f"Table '{spec['requires']}' not found, run 'vcm db migrate'"}), 503
+
+    sql, params = build_page_query(spec, request.args, after_id, limit)
+    cursor.execute(sql, params)
+    rows = cursor.fetchall()
+
+    next_after_id = rows[-1][0] if len(rows) == limit else None
+    return jsonify({
+        'columns': [desc[0] for desc in cursor.description],
+        'rows': [list(row) for row in rows],
+        'next_after_id': next_after_id,
+    })
@@ -1,112 +1,97 @@
 from flask import Blueprint, render_template
-import sqlite3
-import os
 
-main_routes = Blueprint('main_routes', __name__)
+from utils.db import get_db
 
-def get_db_path():
-    # 根据你的实际路径调整
-    vtool_home = os.getenv("VTOOL_HOME", os.getcwd())
-    db_dir = os.path.join(vtool_home, "data")
-    db_path = os.path.join(db_dir, "vcm.db")
-    return db_path
+main_routes = Blueprint('main_routes', __name__)
 
 @main_routes.route('/projects')
 def projects():
-    conn = sqlite3.connect(get_db_path())
-    cursor = conn.cursor()
+    cursor = get_db().cursor()
     cursor.execute("SELECT project_id, project_name, created_at, created_by FROM projects")
     projects = cursor.fetchall()
-    conn.close()
     return render_template('projects.html', projects=projects)
 
 @main_routes.route('/modules')
 def modules():
-    conn = sqlite3.connect(get_db_path())
-    cursor = conn.cursor()
+    cursor = get_db().cursor()
     cursor.execute("SELECT module_id, module_name, project_id, created_at, created_by FROM modules")
     modules = cursor.fetchall()
-    conn.close()
     return render_template('modules.html', modules=modules)
 
+# Case/Regr/Task/Sim 数据量大，页面只渲染表头和筛选条件，
+# 数据由 static/js/main.js 通过 /api/<table> 分页按需加载
 @main_routes.route('/cases')
 def cases():
-    conn = sqlite3.connect(get_db_path())
-    cursor = conn.cursor()
-    cursor.execute("SELECT case_id, module_id, case_name, case_c_name, case_c_group, created_at, created_by FROM case_info")
-    cases = cursor.fetchall()
-    conn.close()
-    return render_template('cases.html', cases=cases)
+    return render_template('cases.html')
 
 @main_routes.route('/regrs')
 def regrs():
-    conn = sqlite3.connect(get_db_path())
-    cursor = conn.cursor()
-    cursor.execute("SELECT regr_id, module_id, regr_base, regr_type, part_name, part_mode, node_name, work_name, work_url, case_list, created_at, created_by FROM regr_info")
-    regrs = cursor.fetchall()
-    conn.close()
-    return render_template('regrs.html', regrs=regrs)
+    return render_template('regrs.html')
 
 @main_routes.route('/tasks')
 def tasks():
-    conn = sqlite3.connect(get_db_path())
-    cursor = conn.cursor()
-    cursor.execute("SELECT task_id, module_id, git_de, git_dv, is_regr, regr_id, node_name, is_post, corner_name, created_at, created_by FROM tasks")
-    tasks = cursor.fetchall()
-    conn.close()
-    return render_template('tasks.html', tasks=tasks)
+    return render_template('tasks.html')
 
 @main_routes.route('/sims')
 def sims():
-    conn = sqlite3.connect(get_db_path())
-    cursor = conn.cursor()
-    cursor.execute("SELECT sim_id, case_id, task_id, case_seed, job_id, is_check, sim_time, error_num, timing_num, is_pass, created_at, created_by FROM sim_info")
-    sims = cursor.fetchall()
-    conn.close()
-    return render_template('sims.html', sims=sims)
+    return render_template('sims.html')
 
-@main_routes.route('/')
-def home():
-    conn = sqlite3.connect(get_db_path())
-    cursor = conn.cursor()
-    cursor.execute("SELECT project_id, project_name FROM projects")
-    projects = cursor.fetchall()
-    project_stats = []
-    for project in projects:
-        project_id, project_name = project
-        cursor.execute("SELECT COUNT(*) FROM modules WHERE project_id=?", (project_id,))
-        module_count = cursor.fetchone()[0]
-        cursor.execute("""
-            SELECT COUNT(*) FROM case_info 
-            WHERE module_id IN (SELECT module_id FROM modules WHERE project_id=?)
-        """, (project_id,))
-        case_count = cursor.fetchone()[0]
-        cursor.execute("""
-            SELECT COUNT(*) FROM regr_info 
-            WHERE module_id IN (SELECT module_id FROM modules WHERE project_id=?)
-        """, (project_id,))
-        regr_count = cursor.fetchone()[0]
-        cursor.execute("""
-            SELECT COUNT(*) FROM tasks 
-            WHERE module_id IN (SELECT module_id FROM modules WHERE project_id=?)
-        """, (project_id,))
-        task_count = cursor.fetchone()[0]
-        cursor.execute("""
-            SELECT COUNT(*) FROM sim_info 
-            WHERE task_id IN (
-                SELECT task_id FROM tasks 
-                WHERE module_id IN (SELECT module_id FROM modules WHERE project_id=?)
-            )
-        """, (project_id,))
-        sim_count = cursor.fetchone()[0]
-        project_stats.append({
+@main_routes.route('/case_stats')
+def case_stats():
+    return render_template('case_stats.html')
+
+# 一次查询统计每个项目的模块、用例、回归、任务和仿真数量：
+# 先按 module 分组计数，再汇总到项目，避免逐项目执行多条 COUNT
+PROJECT_STATS_SQL = """
+    WITH
+    case_counts AS (
+        SELECT module_id, COUNT(*) AS n FROM case_info GROUP BY module_id
+    ),
+    regr_counts AS (
+        SELECT module_id, COUNT(*) AS n FROM regr_info GROUP BY module_id
+    ),
+    task_counts AS (
+        SELECT module_id, COUNT(*) AS n FROM tasks GROUP BY module_id
+    ),
+    sim_counts AS (
+        SELECT t.module_id, SUM(s.n) AS n
+        FROM (SELECT task_id, COUNT(*) AS n FROM sim_info GROUP BY task_id) s
+        JOIN tasks t ON s.task_id = t.task_id
+        GROUP BY t.module_id
+    )
+    SELECT
+        p.project_name,
+        COUNT(m.module_id),
+        COALESCE(SUM(c.n), 0),
+        COALESCE(SUM(r.n), 0),
+        COALESCE(SUM(t.n), 0),
+        COALESCE(SUM(s.n), 0)
+    FROM projects p
+    LEFT JOIN modules m ON m.project_id = p.project_id
+    LEFT JOIN case_counts c ON c.module_id = m.module_id
+    LEFT JOIN regr_counts r ON r.module_id = m.module_id
+    LEFT JOIN task_counts t ON t.module_id = m.module_id
+    LEFT JOIN sim_counts s ON s.module_id = m.module_id
+    GROUP BY p.project_id
+    ORDER BY p.project_id
+"""
+
+def get_project_stats(cursor):
+    cursor.execute(PROJECT_STATS_SQL)
+    return [
+        {
             'name': project_name,
             'module_count': module_count,
             'case_count': case_count,
             'regr_count': regr_count,
             'task_count': task_count,
             'sim_count': sim_count,
-        })
-    conn.close()
-    return render_template('home.html', projects=project_stats)
+        }
+        for project_name, module_count, case_count, regr_count, task_count, sim_count in cursor.fetchall()
+    ]
 
+@main_routes.route('/')
+def home():
+    cursor = get_db().cursor()
+    project_stats = get_project_stats(cursor)
+    return render_template('home.html', projects=project_stats)
@@ -0,0 +1,149 @@
+// 长文本单元格：悬停显示全文，点击复制。分页追加行后对新单元格再次调用
+function bindEllipsis(root) {
+    root.querySelectorAll('.cell-ellipsis').forEach(function(cell) {
+        if (cell.dataset.bound) {
+            return;
+        }
+        cell.dataset.bound = '1';
+        cell.addEventListener('mouseenter', function() {
+            let popup = cell.querySelector('.popup-fulltext');
+            if (popup) {
+                popup.style.display = 'block';
+            }
+        });
+        cell.addEventListener('mouseleave', function() {
+            let popup = cell.querySelector('.popup-fulltext');
+            if (popup) {
+                popup.style.display = 'none';
+            }
+        });
+        // 复制按钮
+        let copyBtn = cell.querySelector('.copy-btn');
+        if (copyBtn) {
+            copyBtn.addEventListener('click', function(e) {
+                e.stopPropagation();
+                let text = cell.getAttribute('data-fulltext');
+                navigator.clipboard.writeText(text);
+                copyBtn.textContent = '已复制';
+                setTimeout(() => { copyBtn.textContent = '复制'; }, 1200);
+            });
+        }
+    });
+}
+
+function makeEllipsisCell(value) {
+    let text = value === null ? '' : String(value);
+    let cell = document.createElement('span');
+    cell.className = 'cell-ellipsis';
+    cell.setAttribute('data-fulltext', text);
+    cell.appendChild(document.createTextNode(text.length > 24 ? text.slice(0, 24) + '...' : text));
+    let popup = document.createElement('span');
+    popup.className = 'popup-fulltext';
+    popup.appendChild(document.createTextNode(text));
+    let copyBtn = document.createElement('button');
+    copyBtn.className = 'copy-btn';
+    copyBtn.type = 'button';
+    copyBtn.textContent = '复制';
+    popup.appendChild(copyBtn);
+    cell.appendChild(popup);
+    return cell;
+}
+
+// 分页表格：<table class="paged-table" data-api="/api/sims">，
+// 按 next_after_id 键集翻页，筛选条件变化时清空表格从第一页重新加载
+function PagedTable(table) {
+    this.table = table;
+    this.api = table.dataset.api;
+    this.ellipsisColumns = (table.dataset.ellipsisColumns || '').split(',').filter(Boolean).map(Number);
+    this.filterForm = document.querySelector('.paged-filter[data-table="' + table.id + '"]');
+    this.moreButton = document.querySelector('.load-more[data-table="' + table.id + '"]');
+    this.status = document.querySelector('.paged-status[data-table="' + table.id + '"]');
+    this.filters = {};
+    this.afterId = null;
+    this.loading = false;
+    this.loaded = 0;
+}
+
+PagedTable.prototype.reset = function(filters) {
+    this.filters = filters;
+    this.afterId = null;
+    this.loaded = 0;
+    this.table.tBodies[0].innerHTML = '';
+    this.moreButton.style.display = '';
+    this.loadPage();
+};
+
+PagedTable.prototype.loadPage = function() {
+    if (this.loading) {
+        return;
+    }
+    this.loading = true;
+    let params = new URLSearchParams(this.filters);
+    if (this.afterId !== null) {
+        params.set('after_id', this.afterId);
+    }
+    this.status.textContent = '加载中...';
+    fetch(this.api + '?' + params.toString())
+        .then(response => response.json().then(data => {
+            if (!response.ok) {
+                throw new Error(data.error || response.statusText);
+            }
+            return data;
+        }))
+        .then(data => {
+            this.appendRows(data.rows);
+            this.afterId = data.next_after_id;
+            this.status.textContent = '已加载 ' + this.loaded + ' 条';
+            if (this.afterId === null) {
+                this.moreButton.style.display = 'none';
+            }
+        })
+        .catch(error => {
+            this.status.textContent = '加载失败: ' + error.message;
+        })
+        .finally(() => {
+            this.loading = false;
+        });
+};
+
+PagedTable.prototype.appendRows = function(rows) {
+    let tbody = this.table.tBodies[0];
+    rows.forEach(row => {
+        let tr = document.createElement('tr');
+        row.forEach((value, index) => {
+            let td = document.createElement('td');
+            if (this.ellipsisColumns.includes(index)) {
+                td.appendChild(makeEllipsisCell(value));
+            } else {
+                td.textContent = value === null ? 'None' : value;
+            }
+            tr.appendChild(td);
+        });
+        tbody.appendChild(tr);
+    });
+    this.loaded += rows.length;
+    bindEllipsis(tbody);
+};
+
+document.addEventListener('DOMContentLoaded', function() {
+    bindEllipsis(document);
+    document.querySelectorAll('.paged-table').forEach(function(table) {
+        let paged = new PagedTable(table);
+        paged.moreButton.addEventListener('click', function() {
+            paged.loadPage();
+        });
+        if (paged.filterForm) {
+            paged.filterForm.addEventListener('submit', function(e) {
+                e.preventDefault();
+                let filters = {};
+                new FormData(paged.filterForm).forEach(function(value, key) {
+                    if (value !== '') {
+                        filters[key] = value;
+                    }
+                });
+                paged.reset(filters);
+            });
+        }
+        paged.reset({});
+    });
+});
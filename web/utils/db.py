@@ -0,0 +1,109 @@
+import os
+import sqlite3
+import threading
+from urllib.parse import quote
+
+from flask import current_app, g
+
+DB_POOL_SIZE = 8
+DB_BUSY_TIMEOUT = 5000          # 毫秒
+DB_CACHE_SIZE = -65536          # 负数表示 KiB，即每个连接 64 MiB 页缓存
+DB_MMAP_SIZE = 256 * 1024 * 1024
+
+def get_db_path():
+    # 根据你的实际路径调整
+    vtool_home = os.getenv("VTOOL_HOME", os.getcwd())
+    db_dir = os.path.join(vtool_home, "data")
+    db_path = os.path.join(db_dir, "vcm.db")
+    return db_path
+
+def open_readonly_connection(db_path):
+    """
+    以只读方式打开数据库（mode=ro URI + query_only），网页查询不会持有写锁，也不会误写数据库。
+
+    连接使用 autocommit 模式，由调用方显式 BEGIN / ROLLBACK 控制读事务。
+    """
+    uri = f"file:{quote(os.path.abspath(db_path))}?mode=ro"
+    conn = sqlite3.connect(uri, uri=True, isolation_level=None, check_same_thread=False)
+    conn.execute(f"PRAGMA busy_timeout={DB_BUSY_TIMEOUT}")
+    conn.execute("PRAGMA query_only=ON")
+    conn.execute(f"PRAGMA cache_size={DB_CACHE_SIZE}")
+    conn.execute(f"PRAGMA mmap_size={DB_MMAP_SIZE}")
+    return conn
+
+class ReadOnlyPool:
+    """
+    每个 worker 进程一个只读连接池。
+
+    连接在首次使用时创建并在请求结束后归还复用，空闲连接最多保留 max_size 个；
+    gunicorn 等预先 fork 的 worker 中检测到进程号变化时丢弃父进程的连接。
+    """
+    def __init__(self, db_path, max_size=DB_POOL_SIZE):
+        self.db_path = db_path
+        self.max_size = max_size
+        self.lock = threading.Lock()
+        self.idle = []
+        self.pid = os.getpid()
+
+    def _check_pid(self):
+        if self.pid != os.getpid():
+            self.idle = []
+            self.pid = os.getpid()
+
+    def acquire(self):
+        with self.lock:
+            self._check_pid()
+            if self.idle:
+                return self.idle.pop()
+        return open_readonly_connection(self.db_path)
+
+    def release(self, conn):
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+        except sqlite3.Error:
+            conn.close()
+            return
+        with self.lock:
+            self._check_pid()
+            if len(self.idle) < self.max_size:
+                self.idle.append(conn)
+                return
+        conn.close()
+
+    def close(self):
+        with self.lock:
+            idle, self.idle = self.idle, []
+        for conn in idle:
+            conn.close()
+
+def init_db_pool(app):
+    """
+    为应用创建只读连接池，并在每个请求结束时归还连接。
+
+    配置项:
+        VCM_DB_PATH: 数据库路径，默认 $VTOOL_HOME/data/vcm.db。
+        VCM_DB_POOL_SIZE: 每个 worker 保留的空闲连接数。
+    """
+    app.config.setdefault('VCM_DB_PATH', get_db_path())
+    app.config.setdefault('VCM_DB_POOL_SIZE', DB_POOL_SIZE)
+    app.extensions['vcm_db_pool'] = ReadOnlyPool(app.config['VCM_DB_PATH'], app.config['VCM_DB_POOL_SIZE'])
+    app.teardown_appcontext(release_db)
+
+def get_db():
+    """
+    获取当前请求使用的只读连接。
+
+    同一请求内的查询处于同一个读事务中，WAL 模式下读到的是同一个快照，
+    不受 CLI 回归写入的影响，也不会阻塞写入。
+    """
+    if 'db' not in g:
+        conn = current_app.extensions['vcm_db_pool'].acquire()
+        conn.execute("BEGIN")
+        g.db = conn
+    return g.db
+
+def release_db(exception=None):
+    conn = g.pop('db', None)
+    if conn is not None:
+        current_app.extensions['vcm_db_pool'].release(conn)